@@ -0,0 +1,13 @@
+from django.conf import settings
+
+# Бэкенды, которые хранят данные в памяти одного процесса или не хранят
+# вовсе: изменения в одном процессе не видны в других
+LOCAL_BACKENDS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+def is_shared(alias="default"):
+    """Общий ли кэш alias для всех процессов (Redis, Memcached, БД, файлы)."""
+    return settings.CACHES[alias]["BACKEND"] not in LOCAL_BACKENDS
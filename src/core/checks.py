@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.core.checks import Error, register
+
+from src.core.cache import is_shared
+
+
+@register()
+def throttle_backend_check(app_configs, **kwargs):
+    """THROTTLE_BACKEND=cache имеет смысл только с общим кэшем."""
+    if settings.THROTTLE_BACKEND == "cache" and not is_shared():
+        return [
+            Error(
+                "THROTTLE_BACKEND=cache требует общего для процессов кэша.",
+                hint="Настройте CACHES (Redis, Memcached) или используйте "
+                "THROTTLE_BACKEND=local.",
+                id="core.E001",
+            )
+        ]
+    return []
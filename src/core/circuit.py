@@ -0,0 +1,148 @@
+import threading
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+# Значения для gauge-метрики
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpen(Exception):
+    """Удаленный сервис признан недоступным, вызов не выполнялся."""
+
+    def __init__(self, name, retry_after):
+        super().__init__(f"{name}: сервис недоступен, повтор через {retry_after:.0f} с")
+        self.retry_after = retry_after
+
+
+class Busy(Exception):
+    """Все слоты для вызовов удаленного сервиса заняты."""
+
+
+class CircuitBreaker:
+    """Предохранитель для вызовов удаленного сервиса.
+
+    closed - вызовы идут как обычно. После failure_threshold ошибок
+    подряд предохранитель размыкается (open): вызовы сразу получают
+    CircuitOpen, не нагружая сервис и не занимая потоки. Через
+    reset_timeout секунд он переходит в half_open и пропускает не больше
+    half_open_max пробных вызовов: успех замыкает цепь, ошибка снова
+    размыкает ее.
+
+    Кроме того, одновременно выполняется не больше max_concurrency
+    вызовов; лишние ждут слот не дольше acquire_timeout и получают Busy.
+
+    Состояние хранится в памяти процесса.
+    """
+
+    def __init__(
+        self,
+        name,
+        failure_threshold=5,
+        reset_timeout=30,
+        half_open_max=1,
+        max_concurrency=10,
+        acquire_timeout=1,
+        on_change=None,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max = half_open_max
+        self.acquire_timeout = acquire_timeout
+        self.on_change = on_change
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+
+    @property
+    def state(self):
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def retry_after(self):
+        """Через сколько секунд можно будет пробовать снова (0 - сейчас)."""
+        with self._lock:
+            if self._state != OPEN:
+                return 0.0
+            return max(self._opened_at + self.reset_timeout - time.monotonic(), 0.0)
+
+    def available(self):
+        """Можно ли сейчас вызывать сервис (не занимая пробный вызов)."""
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == OPEN:
+                return False
+            return self._state == CLOSED or self._probes < self.half_open_max
+
+    def _set_state(self, state):
+        if state != self._state:
+            self._state = state
+            if self.on_change:
+                self.on_change(self.name, state)
+
+    def _maybe_half_open(self):
+        if (
+            self._state == OPEN
+            and time.monotonic() - self._opened_at >= self.reset_timeout
+        ):
+            self._probes = 0
+            self._set_state(HALF_OPEN)
+
+    def _before_call(self):
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == OPEN or (
+                self._state == HALF_OPEN and self._probes >= self.half_open_max
+            ):
+                retry = self._opened_at + self.reset_timeout - time.monotonic()
+                raise CircuitOpen(self.name, max(retry, 0.0))
+            if self._state == HALF_OPEN:
+                self._probes += 1
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._probes = 0
+            self._set_state(CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                self._probes = 0
+                self._set_state(OPEN)
+
+    def _release_probe(self):
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes:
+                self._probes -= 1
+
+    def call(self, func, *args, is_failure=None, **kwargs):
+        """Вызывает func под предохранителем и ограничением параллелизма.
+
+        is_failure(exc) решает, считать ли исключение отказом сервиса
+        (по умолчанию - любое). Исключения пробрасываются дальше.
+        """
+        self._before_call()
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            self._release_probe()
+            raise Busy(f"{self.name}: все слоты заняты")
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            if is_failure is None or is_failure(e):
+                self.record_failure()
+            else:
+                self.record_success()
+            raise
+        finally:
+            self._slots.release()
+        self.record_success()
+        return result
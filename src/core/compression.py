@@ -0,0 +1,149 @@
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+from src.core.metrics import compression_cache
+
+try:
+    import brotli
+except ImportError:  # brotli - необязательная зависимость
+    brotli = None
+
+# Сжимаем только ответы API. HTML (админка) не трогаем: в нем есть
+# CSRF-токен, а детерминированное сжатие с кэшем открыло бы BREACH.
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "text/csv",
+    "text/plain",
+)
+
+
+def parse_accept_encoding(header):
+    """{кодировка: q} из заголовка Accept-Encoding."""
+    result = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        result[name] = q
+    return result
+
+
+def choose_encoding(header):
+    """br, gzip или None - что поддерживает клиент и мы."""
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get("*", 0)
+    for name in ("br", "gzip"):
+        if name == "br" and brotli is None:
+            continue
+        if accepted.get(name, wildcard) > 0:
+            return name
+    return None
+
+
+def compress(body, encoding):
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    # mtime=0: одинаковое тело дает одинаковый результат
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+class CompressedCache:
+    """LRU сжатых тел по (кодировка, sha256 исходного тела).
+
+    Горячие страницы (одинаковый JSON для многих клиентов) сжимаются
+    один раз, дальше берутся из памяти. Хэш считается в разы быстрее,
+    чем сжатие. Размер ограничен max_bytes сжатых данных.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._items = OrderedDict()
+        self._size = 0
+
+    def get(self, body, encoding):
+        key = (encoding, hashlib.sha256(body).digest())
+        with self._lock:
+            data = self._items.get(key)
+            if data is not None:
+                self._items.move_to_end(key)
+                compression_cache.inc(result="hit")
+                return data
+
+        compression_cache.inc(result="miss")
+        data = compress(body, encoding)
+        if len(data) > self.max_bytes:
+            return data
+        with self._lock:
+            if key not in self._items:
+                self._items[key] = data
+                self._size += len(data)
+                while self._size > self.max_bytes:
+                    _, old = self._items.popitem(last=False)
+                    self._size -= len(old)
+        return data
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._size = 0
+
+
+compressed_cache = CompressedCache(settings.COMPRESSION_CACHE_BYTES)
+
+
+class CompressionMiddleware:
+    """Сжатие ответов API в br (если установлен brotli) или gzip
+    по заголовку Accept-Encoding.
+
+    Маленькие ответы (меньше COMPRESSION_MIN_SIZE) и потоковые ответы
+    не сжимаются: выгрузки сжимают себя сами (?gzip=1).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        if (
+            response.streaming
+            or response.has_header("Content-Encoding")
+            or len(response.content) < settings.COMPRESSION_MIN_SIZE
+        ):
+            return response
+        content_type = response.get("Content-Type", "").split(";")[0].strip()
+        if content_type not in COMPRESSIBLE_TYPES:
+            return response
+
+        encoding = choose_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding is None:
+            return response
+
+        compressed = compressed_cache.get(response.content, encoding)
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response["Content-Length"] = str(len(compressed))
+        response["Content-Encoding"] = encoding
+        # Тело изменилось: сильный ETag больше не подходит
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        return response
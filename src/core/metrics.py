@@ -0,0 +1,413 @@
+import atexit
+import fcntl
+import hmac
+import json
+import math
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+# Снимки завершившихся процессов, свернутые в один файл
+AGGREGATE_FILE = "_exited.json"
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+class Counter:
+    """Монотонно растущий счетчик."""
+
+    kind = "counter"
+
+    def __init__(self, registry, name, help_text, labelnames=()):
+        self.registry = registry
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self.registry.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+        self.registry.changed()
+
+    def dump(self):
+        return [[list(key), value] for key, value in self.values.items()]
+
+
+class Histogram:
+    """Гистограмма с фиксированными корзинами (как в Prometheus)."""
+
+    kind = "histogram"
+
+    def __init__(self, registry, name, help_text, labelnames=(), buckets=None):
+        self.registry = registry
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets or DEFAULT_BUCKETS)
+        # labels -> [счетчики по корзинам..., +Inf, сумма]
+        self.values = {}
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self.registry.lock:
+            row = self.values.get(key)
+            if row is None:
+                row = self.values[key] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    row[i] += 1
+            row[-2] += 1
+            row[-1] += value
+        self.registry.changed()
+
+    def time(self, **labels):
+        return _Timer(self, labels)
+
+    def dump(self):
+        return [[list(key), row] for key, row in self.values.items()]
+
+
+class _Timer:
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+
+
+class Registry:
+    """Метрики процесса.
+
+    Счетчики и гистограммы живут в памяти, а для сбора со всех процессов
+    (несколько воркеров gunicorn, команды manage.py) каждый процесс
+    периодически сохраняет снимок в METRICS_DIR. При запросе /metrics
+    снимки всех процессов суммируются. Gauge-метрики считаются в момент
+    запроса функциями-сборщиками (collectors).
+    """
+
+    def __init__(self, directory=None, flush_interval=5):
+        self.lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self.metrics = {}
+        self.collectors = []
+        self.directory = Path(directory) if directory else None
+        self.flush_interval = flush_interval
+        self._dirty = False
+        self._flushed_at = time.monotonic()
+        # pid может повториться после перезапуска, поэтому добавляем uuid
+        self._filename = f"{os.getpid()}-{uuid.uuid4().hex[:8]}.json"
+        atexit.register(self.flush)
+
+    def counter(self, name, help_text, labelnames=()):
+        return self._add(Counter(self, name, help_text, labelnames))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=None):
+        return self._add(Histogram(self, name, help_text, labelnames, buckets))
+
+    def _add(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    def collector(self, func):
+        """Регистрирует функцию, которая возвращает список
+        (имя, help, значение) для gauge-метрик."""
+        self.collectors.append(func)
+        return func
+
+    def changed(self):
+        self._dirty = True
+        if time.monotonic() - self._flushed_at >= self.flush_interval:
+            self.flush()
+
+    def snapshot(self):
+        with self.lock:
+            return {name: metric.dump() for name, metric in self.metrics.items()}
+
+    def flush(self):
+        """Сохраняет снимок метрик процесса на диск."""
+        self._flushed_at = time.monotonic()
+        if self.directory is None or not self._dirty:
+            return
+        with self._flush_lock:
+            self._dirty = False
+            self.directory.mkdir(parents=True, exist_ok=True)
+            _write_json(self.directory / self._filename, self.snapshot())
+
+    def _merged(self):
+        """Суммирует снимки всех процессов."""
+        if self.directory is None:
+            return merge_snapshots([self.snapshot()])
+
+        self.flush()
+        self.compact()
+        aggregate = _read_json(self.directory / AGGREGATE_FILE) or {}
+        skip = {self._filename, AGGREGATE_FILE, *aggregate.get("files", ())}
+        snapshots = [self.snapshot(), aggregate.get("metrics", {})]
+        for path in self.directory.glob("*.json"):
+            if path.name in skip:
+                continue
+            snapshot = _read_json(path)
+            if snapshot is not None:
+                snapshots.append(snapshot)
+        return merge_snapshots(snapshots)
+
+    def compact(self):
+        """Сворачивает снимки завершившихся процессов в AGGREGATE_FILE.
+
+        Иначе файлы команд manage.py, перезапущенных воркеров и дочерних
+        процессов копятся, и каждый запрос /metrics читает их все.
+        В списке files агрегата - уже учтенные снимки: если процесс упадет
+        между записью агрегата и удалением файлов, они не посчитаются
+        дважды.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.directory / ".compact.lock", "w") as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                # Сворачивает другой процесс
+                return
+            exited = [
+                path
+                for path in self.directory.glob("*.json")
+                if path.name != AGGREGATE_FILE and not _alive(_file_pid(path))
+            ]
+            if not exited:
+                return
+
+            aggregate_path = self.directory / AGGREGATE_FILE
+            aggregate = _read_json(aggregate_path) or {}
+            merged_files = set(aggregate.get("files", ()))
+            snapshots = [aggregate.get("metrics", {})]
+            for path in exited:
+                if path.name in merged_files:
+                    continue
+                snapshot = _read_json(path)
+                if snapshot is not None:
+                    snapshots.append(snapshot)
+
+            _write_json(
+                aggregate_path,
+                {
+                    "files": sorted(path.name for path in exited),
+                    "metrics": {
+                        name: [[list(key), value] for key, value in rows.items()]
+                        for name, rows in merge_snapshots(snapshots).items()
+                    },
+                },
+            )
+            for path in exited:
+                path.unlink(missing_ok=True)
+
+    def render(self):
+        """Текст в формате Prometheus exposition."""
+        lines = []
+        merged = self._merged()
+
+        for name, metric in self.metrics.items():
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for key, value in sorted(merged.get(name, {}).items()):
+                labels = list(zip(metric.labelnames, key))
+                if metric.kind == "counter":
+                    lines.append(f"{name}{_labels(labels)} {value}")
+                    continue
+                for bound, count in zip(metric.buckets, value):
+                    bucket_labels = [*labels, ("le", _number(bound))]
+                    lines.append(f"{name}_bucket{_labels(bucket_labels)} {count}")
+                inf_labels = [*labels, ("le", "+Inf")]
+                lines.append(f"{name}_bucket{_labels(inf_labels)} {value[-2]}")
+                lines.append(f"{name}_count{_labels(labels)} {value[-2]}")
+                lines.append(f"{name}_sum{_labels(labels)} {value[-1]}")
+
+        for collector in self.collectors:
+            for name, help_text, value in collector():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {_number(value)}")
+
+        return "\n".join(lines) + "\n"
+
+
+def merge_snapshots(snapshots):
+    """Суммирует снимки: {метрика: {метки: значение}}."""
+    merged = {}
+    for snapshot in snapshots:
+        for name, rows in snapshot.items():
+            target = merged.setdefault(name, {})
+            for labels, value in rows:
+                key = tuple(labels)
+                if isinstance(value, list):
+                    current = target.get(key) or [0] * len(value)
+                    target[key] = [a + b for a, b in zip(current, value)]
+                else:
+                    target[key] = target.get(key, 0) + value
+    return merged
+
+
+def _read_json(path):
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path, data):
+    # Через временный файл: читатель не увидит файл наполовину
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(data))
+    os.replace(tmp_path, path)
+
+
+def _file_pid(path):
+    """pid процесса из имени снимка "<pid>-<uuid>.json"."""
+    try:
+        return int(path.name.split("-", 1)[0])
+    except ValueError:
+        return None
+
+
+def _alive(pid):
+    if pid is None:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Процесс есть, но принадлежит другому пользователю
+        return True
+    return True
+
+
+def _number(value):
+    if isinstance(value, float) and math.isinf(value):
+        return "+Inf"
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _labels(pairs):
+    if not pairs:
+        return ""
+    body = ",".join(
+        '{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"'))
+        for k, v in pairs
+    )
+    return "{" + body + "}"
+
+
+registry = Registry(
+    directory=settings.METRICS_DIR, flush_interval=settings.METRICS_FLUSH_INTERVAL
+)
+
+# Метрики приложения
+request_latency = registry.histogram(
+    "http_request_duration_seconds",
+    "Время обработки запроса DRF-представлением",
+    ["view", "method", "status"],
+)
+outbox_batch_seconds = registry.histogram(
+    "outbox_batch_send_seconds", "Время отправки одной пачки outbox"
+)
+outbox_sent = registry.counter("outbox_sent_total", "Отправлено уведомлений")
+outbox_failures = registry.counter(
+    "outbox_send_failures_total", "Ошибки отправки уведомлений"
+)
+sync_duration = registry.histogram(
+    "sync_events_duration_seconds",
+    "Длительность синхронизации мероприятий",
+    buckets=(1, 5, 10, 30, 60, 120, 300, 600, 1800),
+)
+sync_added = registry.counter("sync_events_added_total", "Добавлено мероприятий")
+sync_updated = registry.counter("sync_events_updated_total", "Обновлено мероприятий")
+old_events_deleted = registry.counter(
+    "delete_old_events_removed_total", "Перенесено в архив старых мероприятий"
+)
+notifications_circuit = registry.counter(
+    "notifications_circuit_transitions_total",
+    "Переходы предохранителя сервиса уведомлений по состояниям",
+    ["state"],
+)
+compression_cache = registry.counter(
+    "http_compression_cache_total",
+    "Обращения к кэшу сжатых ответов",
+    ["result"],
+)
+registration_batch_size = registry.histogram(
+    "registration_group_commit_batch_size",
+    "Число регистраций в одной групповой транзакции",
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200),
+)
+scheduler_job_duration = registry.histogram(
+    "scheduler_job_duration_seconds",
+    "Длительность задач планировщика",
+    ["job"],
+    buckets=(1, 5, 10, 30, 60, 120, 300, 600, 1800),
+)
+scheduler_job_failures = registry.counter(
+    "scheduler_job_failures_total", "Ошибки задач планировщика", ["job"]
+)
+
+
+class MetricsMiddleware:
+    """Записывает время ответа для каждого DRF-представления."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        response = self.get_response(request)
+        view = getattr(request, "_metrics_view", None)
+        if view is not None:
+            request_latency.observe(
+                time.perf_counter() - start,
+                view=view,
+                method=request.method,
+                status=response.status_code,
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        # as_view() у DRF сохраняет класс представления в атрибуте cls
+        view_class = getattr(view_func, "cls", None)
+        if view_class is not None:
+            request._metrics_view = view_class.__name__
+
+
+def client_ip(request):
+    """Адрес клиента с учетом NUM_PROXIES, как у ограничителей DRF.
+
+    За обратным прокси на том же сервере REMOTE_ADDR у всех запросов
+    127.0.0.1, настоящий адрес берется из X-Forwarded-For.
+    """
+    # DRF импортируем здесь: модуль метрик загружают и воркеры без API
+    from rest_framework.throttling import BaseThrottle
+
+    return BaseThrottle().get_ident(request)
+
+
+def metrics_view(request):
+    """GET /metrics - метрики в формате Prometheus."""
+    token = settings.METRICS_TOKEN
+    if token:
+        given = request.headers.get("Authorization", "")
+        if not hmac.compare_digest(given.encode(), f"Bearer {token}".encode()):
+            return HttpResponseForbidden()
+    elif client_ip(request) not in settings.METRICS_ALLOWED_IPS:
+        # Без токена метрики отдаются только с разрешенных адресов
+        return HttpResponseForbidden()
+    return HttpResponse(
+        registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
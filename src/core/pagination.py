@@ -0,0 +1,159 @@
+import base64
+import json
+
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def estimate_rows(model, using="default"):
+    """Оценка числа строк в таблице по статистике планировщика.
+
+    Возвращает None, если оценку получить нельзя (нет статистики
+    или база не поддерживается).
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    if connection.vendor == "postgresql":
+        sql = "SELECT reltuples::bigint FROM pg_class WHERE relname = %s"
+    elif connection.vendor == "sqlite":
+        # Статистика появляется после ANALYZE (задача analyze_db)
+        sql = "SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1"
+    else:
+        return None
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [table])
+            row = cursor.fetchone()
+    except DatabaseError:
+        row = None
+    if row is None:
+        if connection.vendor == "sqlite":
+            return _max_rowid(connection, table)
+        return None
+    value = int(str(row[0]).split()[0])
+    return value if value >= 0 else None
+
+
+def _max_rowid(connection, table):
+    """Без статистики: max(rowid) - один шаг по B-дереву. Удаленные
+    строки не вычитаются, поэтому это оценка сверху."""
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT max(rowid) FROM {connection.ops.quote_name(table)}")
+            row = cursor.fetchone()
+    except DatabaseError:
+        return None
+    return row[0] if row and row[0] is not None else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """Пагинатор для больших таблиц без полного COUNT(*).
+
+    Для списка без фильтров берется оценка планировщика (на SQLite без
+    статистики - max(rowid)). Список с фильтрами считается честно:
+    урезанное число выдавалось бы за настоящее, и страницы после него
+    были бы недоступны.
+    """
+
+    # Меньше этого числа строк считаем честно
+    estimate_threshold = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if hasattr(queryset, "query") and not queryset.query.where:
+            estimate = estimate_rows(queryset.model, queryset.db)
+            if estimate is not None and estimate >= self.estimate_threshold:
+                return estimate
+        return super().count
+
+
+class KeysetPagination(BasePagination):
+    """Пагинация по ключу (keyset): следующая страница начинается после
+    последней строки предыдущей, а не через OFFSET.
+
+    Каждая страница стоит одинаково (поиск по индексу на ordering),
+    сколько бы строк ни было до нее. Поля ordering должны быть
+    уникальны в совокупности, например ("created_at", "id").
+    Ответ: {"next": ссылка или null, "results": [...]}.
+    """
+
+    ordering = ("created_at", "id")
+    cursor_query_param = "cursor"
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def encode_cursor(self, row):
+        values = [str(self._value(row, field)) for field in self.ordering]
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+    def decode_cursor(self, queryset, cursor):
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            model = queryset.model
+            return [
+                model._meta.get_field(field).to_python(value)
+                for field, value in zip(self.ordering, values, strict=True)
+            ]
+        except Exception:
+            raise NotFound("Неверный курсор")
+
+    def _value(self, row, field):
+        return row[field] if isinstance(row, dict) else getattr(row, field)
+
+    def _after(self, values):
+        """Условие "строго после (v1, v2, ...)" для составного ключа.
+
+        Первое поле дополнительно ограничено снизу (field >= v1): без этого
+        SQLite не видит в цепочке OR диапазона по индексу и просматривает
+        все строки мероприятия до курсора.
+        """
+        condition = Q()
+        for i, field in enumerate(self.ordering):
+            equal = {name: value for name, value in zip(self.ordering[:i], values)}
+            condition |= Q(**equal, **{f"{field}__gt": values[i]})
+        return Q(**{f"{self.ordering[0]}__gte": values[0]}) & condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        queryset = queryset.order_by(*self.ordering)
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            queryset = queryset.filter(
+                self._after(self.decode_cursor(queryset, cursor))
+            )
+
+        # Лишняя строка показывает, есть ли следующая страница
+        rows = list(queryset[: page_size + 1])
+        self.has_next = len(rows) > page_size
+        rows = rows[:page_size]
+        self.last = rows[-1] if rows else None
+        return rows
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.encode_cursor(self.last),
+        )
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
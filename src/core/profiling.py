@@ -0,0 +1,157 @@
+import contextvars
+import json
+import logging
+import random
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from rest_framework.serializers import BaseSerializer
+
+logger = logging.getLogger("src.profiling")
+
+# Профиль текущего запроса (None - запрос не попал в выборку)
+_current_profile = contextvars.ContextVar("request_profile", default=None)
+_serializer_timer_installed = False
+
+
+class RequestProfile:
+    """Счетчики одного запроса: SQL-запросы, время БД и сериализации."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.in_serializer = False
+        self.sql = Counter()
+        self.sql_with_params = Counter()
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.queries += 1
+            self.sql[sql] += 1
+            self.sql_with_params[(sql, repr(params))] += 1
+
+    def duplicates(self):
+        """Одинаковые запросы с одинаковыми параметрами."""
+        return [
+            {"sql": sql[:200], "count": count}
+            for (sql, _), count in self.sql_with_params.items()
+            if count > 1
+        ]
+
+    def similar(self, threshold):
+        """Один и тот же запрос с разными параметрами много раз (N+1)."""
+        return [
+            {"sql": sql[:200], "count": count}
+            for sql, count in self.sql.items()
+            if count >= threshold
+        ]
+
+
+def _install_serializer_timer():
+    """Оборачивает BaseSerializer.data, чтобы считать время сериализации.
+
+    Serializer.data и ListSerializer.data вызывают super().data, поэтому
+    достаточно обернуть базовый класс. Вложенные сериализаторы .data не
+    вызывают, а повторный вход отсекается флагом in_serializer.
+    """
+    global _serializer_timer_installed
+    if _serializer_timer_installed:
+        return
+
+    original = BaseSerializer.data.fget
+
+    def data(self):
+        profile = _current_profile.get()
+        if profile is None or profile.in_serializer:
+            return original(self)
+
+        profile.in_serializer = True
+        start = time.perf_counter()
+        try:
+            return original(self)
+        finally:
+            profile.serializer_time += time.perf_counter() - start
+            profile.in_serializer = False
+
+    BaseSerializer.data = property(data)
+    _serializer_timer_installed = True
+
+
+class QueryProfilingMiddleware:
+    """Профилирование запросов: число SQL-запросов, время БД, сериализации
+    и общее время. Результат отдается в заголовке Server-Timing и пишется
+    в лог src.profiling в виде JSON.
+
+    Включается настройкой PROFILING_SAMPLE_RATE (доля запросов от 0 до 1).
+    При 0 middleware отключается целиком и ничего не стоит.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE
+        self.n_plus_one_threshold = settings.PROFILING_N_PLUS_ONE_THRESHOLD
+        if self.sample_rate <= 0:
+            raise MiddlewareNotUsed()
+        _install_serializer_timer()
+
+    def __call__(self, request):
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(
+                        connection.execute_wrapper(profile.execute_wrapper)
+                    )
+                response = self.get_response(request)
+        finally:
+            _current_profile.reset(token)
+        wall_time = time.perf_counter() - start
+
+        response["Server-Timing"] = ", ".join(
+            [
+                f'db;dur={profile.db_time * 1000:.1f};desc="{profile.queries} queries"',
+                f"serializer;dur={profile.serializer_time * 1000:.1f}",
+                f"total;dur={wall_time * 1000:.1f}",
+            ]
+        )
+
+        duplicates = profile.duplicates()
+        similar = profile.similar(self.n_plus_one_threshold)
+        logger.info(
+            json.dumps(
+                {
+                    "method": request.method,
+                    "path": request.path,
+                    "status": response.status_code,
+                    "queries": profile.queries,
+                    "db_ms": round(profile.db_time * 1000, 2),
+                    "serializer_ms": round(profile.serializer_time * 1000, 2),
+                    "wall_ms": round(wall_time * 1000, 2),
+                    "duplicate_queries": duplicates,
+                    "n_plus_one": similar,
+                },
+                ensure_ascii=False,
+            )
+        )
+        if duplicates or similar:
+            logger.warning(
+                "Повторяющиеся запросы в %s %s: %s",
+                request.method,
+                request.path,
+                [item["sql"] for item in duplicates + similar],
+            )
+        return response
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from datetime import timedelta
 from pathlib import Path
 
@@ -24,6 +25,51 @@ ALLOWED_HOSTS = []
 NOTIFICATIONS_API_TOKEN = os.getenv("NOTIFICATIONS_API_TOKEN")
 NOTIFICATIONS_OWNER_ID = os.getenv("NOTIFICATIONS_OWNER_ID")
 
+# Адреса внешних сервисов (для нагрузочных тестов подменяются заглушками)
+EVENTS_API_URL = os.getenv(
+    "EVENTS_API_URL", "https://events.k3scluster.tech/api/events/"
+)
+NOTIFICATIONS_API_URL = os.getenv(
+    "NOTIFICATIONS_API_URL", "https://notifications.k3scluster.tech/api/notifications"
+)
+
+# Webhook изменений от внешнего API (/api/sync/webhook/): общий секрет
+# для подписи, допустимый возраст подписи (сек.) и размер пачки
+SYNC_WEBHOOK_SECRET = os.getenv("SYNC_WEBHOOK_SECRET")
+SYNC_WEBHOOK_TOLERANCE = 5 * 60
+SYNC_WEBHOOK_MAX_ITEMS = 5000
+
+# Полная синхронизация (sync_events): таймаут запроса страницы (сек.) и
+# срок блокировки, которая не дает запустить вторую синхронизацию
+# параллельно. Блокировка продлевается после каждой страницы.
+SYNC_REQUEST_TIMEOUT = 30
+SYNC_LOCK_TTL = 600
+# Сколько раз подряд --resume продолжает с одной и той же страницы, прежде
+# чем начать синхронизацию сначала (адрес next мог устареть)
+SYNC_MAX_RESUME_ATTEMPTS = 3
+
+# Транспорт воркера outbox: kafka, http или путь к функции send(messages)
+NOTIFICATIONS_TRANSPORT = os.getenv("NOTIFICATIONS_TRANSPORT", "kafka")
+_KAFKA_SERVERS = os.getenv("KAFKA_BOOTSTRAP_SERVERS", "localhost:9092")
+KAFKA_BOOTSTRAP_SERVERS = _KAFKA_SERVERS.split(",")
+KAFKA_NOTIFICATIONS_TOPIC = "notifications_topic"
+KAFKA_REQUEST_TIMEOUT_MS = 5000
+KAFKA_MAX_BLOCK_MS = 2000
+
+# Вызовы сервиса уведомлений (src.events.notifications): таймауты (сек.),
+# одновременные запросы на процесс и сколько ждать свободного слота
+NOTIFICATIONS_CONNECT_TIMEOUT = 2
+NOTIFICATIONS_READ_TIMEOUT = 5
+NOTIFICATIONS_MAX_CONCURRENCY = 10
+NOTIFICATIONS_ACQUIRE_TIMEOUT = 1
+# Предохранитель: после скольких ошибок подряд перестаем вызывать сервис
+# и через сколько секунд пробуем снова
+NOTIFICATIONS_BREAKER_FAILURES = 5
+NOTIFICATIONS_BREAKER_RESET = 30
+# На сколько секунд воркер outbox забирает пачку: за это время ее никто
+# другой не отправит. Должно перекрывать отправку пачки целиком
+OUTBOX_CLAIM_SECONDS = 15 * 60
+
 # Application definition
 
 INSTALLED_APPS = [
@@ -43,6 +89,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "src.core.profiling.QueryProfilingMiddleware",
+    "src.core.metrics.MetricsMiddleware",
+    "src.core.compression.CompressionMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -61,11 +110,30 @@ REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "src.users_auth.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
+    # Лимиты для token bucket (src.core.throttling): N запросов за период,
+    # корзина на N токенов пополняется равномерно
+    "DEFAULT_THROTTLE_RATES": {
+        "login_ip": "30/min",
+        "login_username": "5/min",
+        "register_ip": "10/hour",
+        "token_refresh_ip": "60/min",
+        "event_register_ip": "10/min",
+        "event_register_event": "300/s",
+    },
+    # Сколько прокси перед приложением добавляют X-Forwarded-For. При 0
+    # IP клиента берется из REMOTE_ADDR, а заголовку от клиента не верим.
+    "NUM_PROXIES": int(os.getenv("NUM_PROXIES", "0")),
 }
 
+# Где хранить корзины лимитов: local - в памяти процесса,
+# cache - в общем кэше Django (лимит на все процессы). Для cache нужен
+# общий бэкенд в CACHES (Redis, Memcached): LocMemCache по умолчанию у
+# каждого процесса свой, с ним manage.py check выдаст ошибку.
+THROTTLE_BACKEND = os.getenv("THROTTLE_BACKEND", "local")
+
 ROOT_URLCONF = "src.urls"
 
 TEMPLATES = [
@@ -92,7 +160,15 @@ WSGI_APPLICATION = "src.core.wsgi.application"
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "NAME": os.getenv("SQLITE_PATH", BASE_DIR / "db.sqlite3"),
+        "OPTIONS": {
+            # Транзакция сразу берет блокировку на запись. В режиме
+            # DEFERRED транзакция, начатая с чтения, при первой записи
+            # получает "database is locked" без ожидания timeout.
+            "transaction_mode": "IMMEDIATE",
+            # Сколько секунд ждать освобождения блокировки
+            "timeout": 20,
+        },
     }
 }
 
@@ -115,6 +191,36 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Алгоритм хэширования паролей: pbkdf2, scrypt или argon2
+# (для argon2 нужен пакет argon2-cffi). Остальные алгоритмы остаются
+# в списке, чтобы старые пароли проверялись и перехэшировались при входе.
+PASSWORD_HASHER = os.getenv("PASSWORD_HASHER", "pbkdf2")
+_PASSWORD_HASHERS = {
+    "pbkdf2": "src.users_auth.hashers.TunedPBKDF2PasswordHasher",
+    "scrypt": "src.users_auth.hashers.TunedScryptPasswordHasher",
+    "argon2": "src.users_auth.hashers.TunedArgon2PasswordHasher",
+}
+PASSWORD_HASHERS = [_PASSWORD_HASHERS[PASSWORD_HASHER]] + [
+    path for name, path in _PASSWORD_HASHERS.items() if name != PASSWORD_HASHER
+]
+
+# Параметры хэшеров
+PBKDF2_ITERATIONS = int(os.getenv("PBKDF2_ITERATIONS", "1000000"))
+SCRYPT_WORK_FACTOR = int(os.getenv("SCRYPT_WORK_FACTOR", str(2**14)))
+SCRYPT_BLOCK_SIZE = int(os.getenv("SCRYPT_BLOCK_SIZE", "8"))
+SCRYPT_PARALLELISM = int(os.getenv("SCRYPT_PARALLELISM", "1"))
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "2"))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", "102400"))
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", "8"))
+
+# Проверка пароля при входе идет в пуле хэширования
+AUTHENTICATION_BACKENDS = ["src.users_auth.backends.PooledModelBackend"]
+
+# Пул процессов для хэширования паролей (0 - хэшировать в потоке запроса)
+PASSWORD_HASHING_WORKERS = int(os.getenv("PASSWORD_HASHING_WORKERS", "2"))
+# Сколько хэширований может ждать в очереди, после этого отвечаем 429
+PASSWORD_HASHING_MAX_PENDING = int(os.getenv("PASSWORD_HASHING_MAX_PENDING", "16"))
+
 SIMPLE_JWT = {
     # Access Token живет 15 минут
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=1500),
@@ -126,6 +232,87 @@ SIMPLE_JWT = {
     "BLACKLIST_AFTER_ROTATION": True,
 }
 
+# Сколько секунд пользователь из JWT хранится в кэше. Сброс при изменении
+# пользователя виден всем процессам только с общим кэшем (Redis,
+# Memcached в CACHES). С LocMemCache по умолчанию срок сокращается до
+# AUTH_USER_CACHE_LOCAL_TTL: столько секунд отключенный пользователь или
+# старый пароль еще работают в других воркерах.
+AUTH_USER_CACHE_TTL = 60
+AUTH_USER_CACHE_LOCAL_TTL = 5
+# Как часто (сек.) догружать новые записи черного списка токенов в память
+TOKEN_BLACKLIST_CACHE_REFRESH = 5
+# Как часто (сек.) перечитывать черный список целиком
+TOKEN_BLACKLIST_CACHE_FULL_RELOAD = 60 * 60
+# Сколько последних id черного списка перечитывать при догрузке: записи
+# коммитятся не строго в порядке id
+TOKEN_BLACKLIST_CACHE_OVERLAP = 100
+
+# Профилирование запросов (src.core.profiling): доля запросов в выборке,
+# 0 - выключено, 1 - каждый запрос
+PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+# Сколько одинаковых запросов с разными параметрами считать N+1
+PROFILING_N_PLUS_ONE_THRESHOLD = 5
+
+# Метрики (/metrics): каталог, куда процессы сохраняют снимки своих
+# счетчиков для суммирования (пусто - только метрики текущего процесса)
+METRICS_DIR = os.getenv(
+    "METRICS_DIR", os.path.join(tempfile.gettempdir(), "events-face-metrics")
+)
+# Как часто (сек.) процесс сохраняет снимок метрик
+METRICS_FLUSH_INTERVAL = 5
+# Если задан, /metrics требует заголовок Authorization: Bearer <токен>.
+# Без токена /metrics доступен только с адресов METRICS_ALLOWED_IPS
+# (адрес клиента определяется с учетом NUM_PROXIES).
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+METRICS_ALLOWED_IPS = os.getenv("METRICS_ALLOWED_IPS", "127.0.0.1,::1").split(",")
+
+# Кэш названий площадок (src.events.places): как часто (сек.) сверять
+# версию в общем кэше и как часто перечитывать площадки в любом случае
+PLACE_CACHE_CHECK_INTERVAL = 1
+PLACE_CACHE_MAX_AGE = 5 * 60
+
+# Сжатие ответов API (src.core.compression). brotli используется,
+# если установлен пакет brotli, иначе gzip.
+COMPRESSION_MIN_SIZE = 1024  # байт, меньшие ответы не сжимаем
+COMPRESSION_GZIP_LEVEL = 6
+COMPRESSION_BROTLI_QUALITY = 5
+# Сколько байт сжатых ответов держать в памяти процесса
+COMPRESSION_CACHE_BYTES = 32 * 1024 * 1024
+
+# Групповая запись регистраций (src.events.coalescer): регистрации
+# процесса копятся до WAIT_MS мс или MAX_BATCH штук и пишутся одной
+# транзакцией. Полезно при всплесках регистраций на SQLite.
+REGISTRATION_GROUP_COMMIT = os.getenv("REGISTRATION_GROUP_COMMIT", "") == "1"
+REGISTRATION_GROUP_COMMIT_WAIT_MS = 5
+REGISTRATION_GROUP_COMMIT_MAX_BATCH = 100
+
+# Планировщик (manage.py run_scheduler): интервалы задач в секундах
+SCHEDULER_INTERVALS = {
+    "sync_events": int(os.getenv("SYNC_EVENTS_INTERVAL", "300")),
+    "delete_old_events": 60 * 60,
+    "compact_outbox": 60 * 60,
+    "prune_tokens": 6 * 60 * 60,
+    "prune_job_runs": 24 * 60 * 60,
+    "analyze_db": 6 * 60 * 60,
+}
+# Случайный сдвиг запуска: доля интервала, чтобы узлы не стартовали разом
+SCHEDULER_JITTER = 0.1
+# Отправленные сообщения outbox старше этого числа дней удаляются
+OUTBOX_RETENTION_DAYS = 7
+# История запусков задач (JobRun) старше этого числа дней удаляется
+JOB_RUN_RETENTION_DAYS = 30
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "src": {"handlers": ["console"], "level": "INFO"},
+    },
+}
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -0,0 +1,161 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+from src.core.cache import is_shared
+
+PERIODS = {"s": 1, "m": 60, "h": 60 * 60, "d": 24 * 60 * 60}
+
+
+def parse_rate(rate):
+    """'10/min' -> (емкость корзины, пополнение токенов в секунду)."""
+    num, period = rate.split("/")
+    capacity = int(num)
+    return capacity, capacity / PERIODS[period[0]]
+
+
+def take_token(state, capacity, refill_rate, now):
+    """Пополняет корзину и пытается взять один токен.
+
+    Возвращает (новое состояние, разрешено, сколько секунд ждать).
+    """
+    if state is None:
+        tokens = capacity
+    else:
+        tokens, updated = state
+        tokens = min(capacity, tokens + (now - updated) * refill_rate)
+
+    if tokens >= 1:
+        return (tokens - 1, now), True, 0
+    return (tokens, now), False, (1 - tokens) / refill_rate
+
+
+class LocalBucketStore:
+    """Корзины в памяти процесса. Быстро, но лимит считается на процесс.
+
+    У каждого scope свой LRU не больше max_keys корзин: поток случайных
+    ключей в одном scope (например, id мероприятий) не вытесняет
+    корзины другого (попытки входа по имени пользователя).
+    """
+
+    max_keys = 10000
+
+    def __init__(self):
+        self._scopes = {}
+        self._lock = threading.Lock()
+
+    def consume(self, scope, key, capacity, refill_rate):
+        now = time.monotonic()
+        with self._lock:
+            buckets = self._scopes.setdefault(scope, OrderedDict())
+            state, allowed, wait = take_token(
+                buckets.get(key), capacity, refill_rate, now
+            )
+            buckets[key] = state
+            buckets.move_to_end(key)
+            if len(buckets) > self.max_keys:
+                # Вытесняем корзину, к которой дольше всех не обращались
+                buckets.popitem(last=False)
+        return allowed, wait
+
+
+class CacheBucketStore:
+    """Корзины в общем кэше Django (Redis/Memcached), лимит общий для всех
+    процессов. Чтение и запись не атомарны, поэтому при гонке лимит может
+    быть превышен на несколько запросов.
+
+    С кэшем в памяти процесса (LocMemCache, по умолчанию) лимит общим
+    не будет, поэтому такая настройка не проходит проверку при запуске
+    (src.core.checks)."""
+
+    def consume(self, scope, key, capacity, refill_rate):
+        key = f"throttle:{scope}:{key}"
+        now = time.time()
+        state, allowed, wait = take_token(cache.get(key), capacity, refill_rate, now)
+        # Через это время корзина снова полная и запись не нужна
+        cache.set(key, state, int(capacity / refill_rate) + 1)
+        return allowed, wait
+
+
+STORES = {"local": LocalBucketStore, "cache": CacheBucketStore}
+_store = None
+
+
+def get_store():
+    global _store
+    if _store is None:
+        backend = settings.THROTTLE_BACKEND
+        if backend not in STORES:
+            raise ImproperlyConfigured(f"Неизвестный THROTTLE_BACKEND: {backend}")
+        if backend == "cache" and not is_shared():
+            raise ImproperlyConfigured("THROTTLE_BACKEND=cache требует общего кэша")
+        _store = STORES[backend]()
+    return _store
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Ограничение запросов по алгоритму token bucket.
+
+    Лимит берется из DEFAULT_THROTTLE_RATES по scope, ключ задает
+    get_key() в наследниках (None - не ограничивать).
+    """
+
+    scope = None
+
+    def __init__(self):
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+        self.rate = rate
+        if rate is not None:
+            self.capacity, self.refill_rate = parse_rate(rate)
+        self._wait = None
+
+    def get_key(self, request, view):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        key = self.get_key(request, view)
+        if key is None:
+            return True
+
+        allowed, self._wait = get_store().consume(
+            self.scope, key, self.capacity, self.refill_rate
+        )
+        return allowed
+
+    def wait(self):
+        return self._wait
+
+
+class IPThrottle(TokenBucketThrottle):
+    """Лимит по IP-адресу клиента."""
+
+    def get_key(self, request, view):
+        return self.get_ident(request)
+
+
+class EarlyThrottleMixin:
+    """Проверяет лимиты до аутентификации и любой работы с БД.
+
+    По умолчанию DRF сначала аутентифицирует пользователя и проверяет
+    права, а лимиты - последними.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        self.check_throttles(request)
+        super().initial(request, *args, **kwargs)
+
+    def check_throttles(self, request):
+        # initial() родителя вызовет проверку повторно - пропускаем ее
+        if getattr(self, "_throttles_checked", False):
+            return
+        self._throttles_checked = True
+        super().check_throttles(request)
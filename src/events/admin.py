@@ -1,6 +1,8 @@
 from django.contrib import admin
 
-from .models import Event, Place
+from src.core.pagination import EstimatedCountPaginator
+
+from .models import Event, EventStatus, OutboxMessage, Place, Registration
 
 
 @admin.register(Place)
@@ -12,6 +14,47 @@ class PlaceAdmin(admin.ModelAdmin):
 @admin.register(Event)
 class EventAdmin(admin.ModelAdmin):
     list_display = ["name", "event_time", "status", "place"]
+    list_select_related = ["place"]
+    # Фильтры только по индексированным полям
     list_filter = ["status", "event_time"]
     search_fields = ["name"]
-    date_hierarchy = "event_time"
+    raw_id_fields = ["place"]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = ["close_events"]
+
+    @admin.action(description="Закрыть регистрацию на выбранные мероприятия")
+    def close_events(self, request, queryset):
+        # Один UPDATE вместо сохранения каждого объекта
+        updated = queryset.update(status=EventStatus.CLOSED)
+        self.message_user(request, f"Закрыто мероприятий: {updated}")
+
+
+@admin.register(Registration)
+class RegistrationAdmin(admin.ModelAdmin):
+    list_display = ["full_name", "email", "event", "created_at"]
+    # __str__ регистрации обращается к event.name
+    list_select_related = ["event"]
+    search_fields = ["^email"]
+    autocomplete_fields = ["event"]
+    readonly_fields = ["created_at"]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = ["id", "registration", "sent", "created_at", "sent_at"]
+    # __str__ сообщения обращается к registration, а регистрации - к event
+    list_select_related = ["registration__event"]
+    list_filter = ["sent"]
+    raw_id_fields = ["registration"]
+    readonly_fields = ["created_at"]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = ["requeue"]
+
+    @admin.action(description="Отправить выбранные уведомления повторно")
+    def requeue(self, request, queryset):
+        updated = queryset.update(sent=False, sent_at=None)
+        self.message_user(request, f"Поставлено в очередь: {updated}")
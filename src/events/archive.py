@@ -0,0 +1,117 @@
+import time
+
+from django.db import transaction
+from django.db.models import Count
+
+from src.events.models import (
+    ArchivedEvent,
+    ArchivedRegistration,
+    Event,
+    OutboxMessage,
+    Registration,
+)
+from src.events.places import place_cache
+
+
+def archive_chunk(event_ids, batch_size=1000):
+    """Переносит мероприятия и их регистрации в архив.
+
+    Сначала копируются мероприятия, затем регистрации пачками по
+    batch_size: каждая пачка копируется и удаляется в своей транзакции,
+    поэтому память и длина транзакции не зависят от числа регистраций.
+    Последней транзакцией удаляются сами мероприятия. После сбоя
+    повторный запуск продолжит с оставшихся регистраций.
+
+    Возвращает (мероприятий, регистраций).
+    """
+    with transaction.atomic():
+        events = list(
+            Event.objects.filter(id__in=event_ids)
+            .annotate(total=Count("registrations"))
+            .values("id", "name", "event_time", "status", "place_id", "total")
+        )
+        ArchivedEvent.objects.bulk_create(
+            [
+                ArchivedEvent(
+                    id=event["id"],
+                    name=event["name"],
+                    event_time=event["event_time"],
+                    status=event["status"],
+                    place_id=event["place_id"],
+                    place_name=place_cache.name(event["place_id"]) or "",
+                    registrations_count=event["total"],
+                )
+                for event in events
+            ],
+            # Повторный перенос после сбоя не падает на уже скопированных
+            ignore_conflicts=True,
+        )
+
+    registrations = Registration.objects.filter(event_id__in=event_ids)
+    moved = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                registrations.values_list(
+                    "id", "event_id", "full_name", "email", "created_at"
+                )[:batch_size]
+            )
+            if not batch:
+                break
+            ArchivedRegistration.objects.bulk_create(
+                [
+                    ArchivedRegistration(
+                        id=registration_id,
+                        event_id=event_id,
+                        full_name=full_name,
+                        email=email,
+                        created_at=created_at,
+                    )
+                    for registration_id, event_id, full_name, email, created_at in batch
+                ],
+                ignore_conflicts=True,
+            )
+            ids = [row[0] for row in batch]
+            # Удаляем напрямую, без загрузки объектов и сигнала post_delete:
+            # счетчики мероприятия уже перенесены в архив и удалятся с ним
+            _raw_delete(OutboxMessage.objects.filter(registration_id__in=ids))
+            _raw_delete(Registration.objects.filter(id__in=ids))
+        moved += len(batch)
+        if len(batch) < batch_size:
+            break
+
+    with transaction.atomic():
+        # Регистраций уже нет, удаляются мероприятия и их счетчики
+        Event.objects.filter(id__in=event_ids).delete()
+    return len(events), moved
+
+
+def _raw_delete(queryset):
+    """DELETE ... WHERE без сбора связанных объектов и сигналов."""
+    return queryset._raw_delete(queryset.db)
+
+
+def archive_events(before, chunk_size=200, pause=0.05):
+    """Переносит в архив мероприятия, прошедшие до before, пачками.
+
+    Каждая пачка - отдельные короткие транзакции, чтобы не блокировать
+    горячие таблицы надолго. Возвращает (мероприятий, регистраций).
+    """
+    events_total = 0
+    registrations_total = 0
+    while True:
+        # Индекс по event_time
+        ids = list(
+            Event.objects.filter(event_time__lt=before)
+            .order_by("event_time")
+            .values_list("id", flat=True)[:chunk_size]
+        )
+        if not ids:
+            break
+        events, registrations = archive_chunk(ids)
+        events_total += events
+        registrations_total += registrations
+        if len(ids) < chunk_size:
+            break
+        time.sleep(pause)
+    return events_total, registrations_total
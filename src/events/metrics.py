@@ -0,0 +1,35 @@
+from django.utils import timezone
+
+from src.core.circuit import STATE_VALUES
+from src.core.metrics import registry
+from src.events.notifications import breaker
+
+from .models import OutboxMessage
+
+
+@registry.collector
+def outbox_gauges():
+    """Глубина очереди outbox и возраст самого старого неотправленного."""
+    unsent = OutboxMessage.objects.filter(sent=False)
+    oldest = unsent.order_by("created_at").values_list("created_at", flat=True).first()
+    age = (timezone.now() - oldest).total_seconds() if oldest else 0.0
+    return [
+        ("outbox_queue_depth", "Неотправленных сообщений в outbox", unsent.count()),
+        (
+            "outbox_oldest_unsent_age_seconds",
+            "Возраст самого старого неотправленного сообщения",
+            age,
+        ),
+    ]
+
+
+@registry.collector
+def notifications_circuit_gauges():
+    """Состояние предохранителя в процессе, который отдает /metrics."""
+    return [
+        (
+            "notifications_circuit_state",
+            "Предохранитель уведомлений: 0 - closed, 1 - half_open, 2 - open",
+            STATE_VALUES[breaker.state],
+        ),
+    ]
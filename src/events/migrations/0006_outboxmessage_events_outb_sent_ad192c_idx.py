@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0005_rename_notificationoutbox_outboxmessage"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="outboxmessage",
+            index=models.Index(
+                fields=["sent", "created_at"], name="events_outb_sent_ad192c_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,100 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def backfill_stats(apps, schema_editor):
+    """Заполняет счетчики по уже существующим регистрациям."""
+    Registration = apps.get_model("events", "Registration")
+    EventStats = apps.get_model("events", "EventStats")
+    EventDailyStats = apps.get_model("events", "EventDailyStats")
+
+    totals = Registration.objects.values("event_id").annotate(count=Count("id"))
+    EventStats.objects.bulk_create(
+        [
+            EventStats(event_id=row["event_id"], registrations_count=row["count"])
+            for row in totals.iterator()
+        ],
+        batch_size=1000,
+    )
+    daily = (
+        Registration.objects.annotate(day=TruncDate("created_at"))
+        .values("event_id", "day")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    EventDailyStats.objects.bulk_create(
+        [
+            EventDailyStats(
+                event_id=row["event_id"],
+                day=row["day"],
+                registrations_count=row["count"],
+            )
+            for row in daily.iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0006_outboxmessage_events_outb_sent_ad192c_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EventStats",
+            fields=[
+                (
+                    "event",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="stats",
+                        serialize=False,
+                        to="events.event",
+                    ),
+                ),
+                ("registrations_count", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Статистика мероприятия",
+                "verbose_name_plural": "Статистика мероприятий",
+            },
+        ),
+        migrations.CreateModel(
+            name="EventDailyStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("registrations_count", models.PositiveIntegerField(default=0)),
+                (
+                    "event",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_stats",
+                        to="events.event",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Статистика за день",
+                "verbose_name_plural": "Статистика по дням",
+                "ordering": ["day"],
+                "unique_together": {("event", "day")},
+            },
+        ),
+        migrations.RunPython(backfill_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0007_event_stats"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedEvent",
+            fields=[
+                ("id", models.UUIDField(primary_key=True, serialize=False)),
+                ("name", models.CharField(max_length=255, verbose_name="Название")),
+                ("event_time", models.DateTimeField(verbose_name="Дата проведения")),
+                ("status", models.CharField(max_length=10, verbose_name="Статус")),
+                ("place_id", models.UUIDField(blank=True, null=True)),
+                ("place_name", models.CharField(blank=True, max_length=255)),
+                ("registrations_count", models.PositiveIntegerField(default=0)),
+                ("archived_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Архивное мероприятие",
+                "verbose_name_plural": "Архивные мероприятия",
+                "indexes": [
+                    models.Index(
+                        fields=["event_time", "id"],
+                        name="events_arch_event_t_4b87fc_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchivedRegistration",
+            fields=[
+                ("id", models.UUIDField(primary_key=True, serialize=False)),
+                ("full_name", models.CharField(max_length=128)),
+                ("email", models.EmailField(max_length=254)),
+                ("created_at", models.DateTimeField()),
+                (
+                    "event",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="registrations",
+                        to="events.archivedevent",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Архивная регистрация",
+                "verbose_name_plural": "Архивные регистрации",
+            },
+        ),
+    ]
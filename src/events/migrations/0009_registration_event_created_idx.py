@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0008_archive"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="registration",
+            index=models.Index(
+                fields=["event", "created_at", "id"],
+                name="events_regi_event_i_b458f0_idx",
+            ),
+        ),
+    ]
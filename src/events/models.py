@@ -78,11 +78,56 @@ class Registration(models.Model):
         unique_together = ["event", "email"]
         verbose_name = "Регистрация"
         verbose_name_plural = "Регистрации"
+        indexes = [
+            # Список и выгрузка регистраций мероприятия по порядку
+            # (keyset-пагинация по created_at, id)
+            models.Index(fields=["event", "created_at", "id"]),
+        ]
 
     def __str__(self):
         return f"{self.full_name} на {self.event.name}"
 
 
+class EventStats(models.Model):
+    """Счетчик регистраций на мероприятие.
+
+    Обновляется в той же транзакции, что и создание/удаление регистрации,
+    чтобы не считать Count("registrations") на каждый запрос.
+    """
+
+    event = models.OneToOneField(
+        Event, on_delete=models.CASCADE, primary_key=True, related_name="stats"
+    )
+    registrations_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Статистика мероприятия"
+        verbose_name_plural = "Статистика мероприятий"
+
+    def __str__(self):
+        return f"{self.event_id}: {self.registrations_count}"
+
+
+class EventDailyStats(models.Model):
+    """Число регистраций на мероприятие за день."""
+
+    event = models.ForeignKey(
+        Event, on_delete=models.CASCADE, related_name="daily_stats"
+    )
+    day = models.DateField()
+    registrations_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ["event", "day"]
+        ordering = ["day"]
+        verbose_name = "Статистика за день"
+        verbose_name_plural = "Статистика по дням"
+
+    def __str__(self):
+        return f"{self.event_id} {self.day}: {self.registrations_count}"
+
+
 class OutboxMessage(models.Model):
     """Исходящие уведомления."""
 
@@ -94,9 +139,56 @@ class OutboxMessage(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     sent = models.BooleanField(default=False)
     sent_at = models.DateTimeField(null=True, blank=True)
+    # Воркер забрал сообщение на отправку до этого момента
+    claimed_until = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         ordering = ["created_at"]
+        indexes = [
+            # Для воркера и фильтра в админке: неотправленные по времени
+            models.Index(fields=["sent", "created_at"]),
+        ]
 
     def __str__(self):
         return f"Notification for {self.registration.email}"
+
+
+class ArchivedEvent(models.Model):
+    """Прошедшее мероприятие, перенесенное из Event.
+
+    Площадка хранится названием, счетчик регистраций посчитан при
+    переносе: архив читается без JOIN и без обращения к горячим таблицам.
+    """
+
+    id = models.UUIDField(primary_key=True)
+    name = models.CharField(max_length=255, verbose_name="Название")
+    event_time = models.DateTimeField(verbose_name="Дата проведения")
+    status = models.CharField(max_length=10, verbose_name="Статус")
+    place_id = models.UUIDField(null=True, blank=True)
+    place_name = models.CharField(max_length=255, blank=True)
+    registrations_count = models.PositiveIntegerField(default=0)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Архивное мероприятие"
+        verbose_name_plural = "Архивные мероприятия"
+        indexes = [models.Index(fields=["event_time", "id"])]
+
+    def __str__(self):
+        return f"{self.name} ({self.event_time})"
+
+
+class ArchivedRegistration(models.Model):
+    """Регистрация на архивное мероприятие (без кода подтверждения)."""
+
+    id = models.UUIDField(primary_key=True)
+    event = models.ForeignKey(
+        ArchivedEvent, on_delete=models.CASCADE, related_name="registrations"
+    )
+    full_name = models.CharField(max_length=128)
+    email = models.EmailField()
+    created_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "Архивная регистрация"
+        verbose_name_plural = "Архивные регистрации"
@@ -0,0 +1,165 @@
+"""Транспорты уведомлений.
+
+Клиенты Kafka и HTTP импортируются при первой отправке, поэтому
+веб-процессы, которые их не используют, не тратят на них время запуска
+и память.
+
+Все вызовы идут через общий предохранитель (breaker): с таймаутами,
+ограничением числа одновременных запросов и быстрым отказом, пока
+сервис уведомлений недоступен.
+"""
+
+import json
+import logging
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from src.core.circuit import Busy, CircuitBreaker, CircuitOpen
+from src.core.metrics import notifications_circuit, outbox_failures
+
+logger = logging.getLogger(__name__)
+
+_producer = None
+_session = None
+
+
+def _state_changed(name, state):
+    notifications_circuit.inc(state=state)
+    log = logger.info if state == "closed" else logger.warning
+    log("Предохранитель %s: %s", name, state)
+
+
+breaker = CircuitBreaker(
+    "notifications",
+    failure_threshold=settings.NOTIFICATIONS_BREAKER_FAILURES,
+    reset_timeout=settings.NOTIFICATIONS_BREAKER_RESET,
+    max_concurrency=settings.NOTIFICATIONS_MAX_CONCURRENCY,
+    acquire_timeout=settings.NOTIFICATIONS_ACQUIRE_TIMEOUT,
+    on_change=_state_changed,
+)
+
+
+def _headers():
+    return {
+        "Authorization": str(settings.NOTIFICATIONS_API_TOKEN),
+        "Content-Type": "application/json",
+    }
+
+
+def get_session():
+    """Общая HTTP-сессия процесса (переиспользует соединения)."""
+    global _session
+    if _session is None:
+        import requests
+
+        _session = requests.Session()
+    return _session
+
+
+def get_producer():
+    """Продюсер Kafka, создается один раз на процесс."""
+    global _producer
+    if _producer is None:
+        from kafka import KafkaProducer
+
+        _producer = KafkaProducer(
+            bootstrap_servers=settings.KAFKA_BOOTSTRAP_SERVERS,
+            value_serializer=lambda v: json.dumps(v).encode("utf-8"),
+            request_timeout_ms=settings.KAFKA_REQUEST_TIMEOUT_MS,
+            max_block_ms=settings.KAFKA_MAX_BLOCK_MS,
+        )
+    return _producer
+
+
+def _is_failure(error):
+    """Ответы 4xx (кроме 429) - ошибка запроса, а не отказ сервиса."""
+    response = getattr(error, "response", None)
+    if response is not None and 400 <= response.status_code < 500:
+        return response.status_code == 429
+    return True
+
+
+def _post(payload):
+    response = get_session().post(
+        settings.NOTIFICATIONS_API_URL,
+        json=payload,
+        headers=_headers(),
+        timeout=(
+            settings.NOTIFICATIONS_CONNECT_TIMEOUT,
+            settings.NOTIFICATIONS_READ_TIMEOUT,
+        ),
+    )
+    response.raise_for_status()
+
+
+def send_notification(payload):
+    """Отправляет одно уведомление в сервис уведомлений по HTTP.
+    При ошибке выбрасывает исключение, пока сервис недоступен - сразу
+    CircuitOpen."""
+    breaker.call(_post, payload, is_failure=_is_failure)
+
+
+def send_http(messages):
+    """Отправляет сообщения outbox по HTTP. Возвращает id отправленных."""
+    sent_ids = []
+    for message in messages:
+        try:
+            send_notification(message.payload)
+            sent_ids.append(message.id)
+        except (CircuitOpen, Busy) as e:
+            # Остальные сообщения останутся в outbox до следующей попытки
+            logger.warning(f"Outbox paused: {e}")
+            break
+        except Exception as e:
+            outbox_failures.inc()
+            logger.error(f"Failed to process message {message.id}: {e}")
+    return sent_ids
+
+
+def _send_kafka_batch(messages):
+    producer = get_producer()
+    futures = [
+        (
+            message.id,
+            producer.send(settings.KAFKA_NOTIFICATIONS_TOPIC, value=message.payload),
+        )
+        for message in messages
+    ]
+    producer.flush(timeout=settings.KAFKA_REQUEST_TIMEOUT_MS / 1000)
+    sent_ids = []
+    for message_id, future in futures:
+        if future.succeeded():
+            sent_ids.append(message_id)
+        else:
+            outbox_failures.inc()
+            logger.error(f"Failed to process message {message_id}: {future.exception}")
+    if messages and not sent_ids:
+        # Для предохранителя это отказ брокера
+        raise RuntimeError("Kafka не приняла ни одного сообщения")
+    return sent_ids
+
+
+def send_to_kafka(messages):
+    """Отправляет сообщения в Kafka. Возвращает id успешно отправленных."""
+    return breaker.call(_send_kafka_batch, messages)
+
+
+def available():
+    """Можно ли сейчас отправлять уведомления."""
+    return breaker.available()
+
+
+TRANSPORTS = {
+    "kafka": send_to_kafka,
+    "http": send_http,
+}
+
+
+def get_transport():
+    """Транспорт outbox из NOTIFICATIONS_TRANSPORT: kafka, http
+    или путь к функции send(messages)."""
+    name = settings.NOTIFICATIONS_TRANSPORT
+    if name in TRANSPORTS:
+        return TRANSPORTS[name]
+    return import_string(name)
@@ -0,0 +1,132 @@
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+from src.events.models import Place
+
+VERSION_KEY = "places:version"
+
+
+def _key(place_id):
+    return place_id if isinstance(place_id, uuid.UUID) else uuid.UUID(str(place_id))
+
+
+class PlaceCache:
+    """Названия площадок (id -> name) в памяти процесса.
+
+    Площадок немного (сотни), а нужны они на каждый запрос списка
+    мероприятий и на каждое мероприятие при синхронизации. Таблица
+    читается целиком и перечитывается, когда меняется версия в общем
+    кэше Django (ее увеличивает invalidate() при сохранении или удалении
+    площадки). Версия проверяется не чаще раза в check_interval секунд,
+    а раз в max_age секунд таблица перечитывается в любом случае.
+    """
+
+    def __init__(self, check_interval=1, max_age=300):
+        self.check_interval = check_interval
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._names = {}
+        self._version = None
+        self._checked_at = None
+        self._loaded_at = None
+
+    def _load(self, version):
+        self._names = dict(Place.objects.values_list("id", "name"))
+        self._version = version
+        self._loaded_at = time.monotonic()
+
+    def refresh(self, force=False):
+        """Перечитывает площадки, если версия изменилась."""
+        now = time.monotonic()
+        with self._lock:
+            if (
+                not force
+                and self._checked_at is not None
+                and now - self._checked_at < self.check_interval
+            ):
+                return
+            self._checked_at = now
+            version = cache.get(VERSION_KEY, 0)
+            if (
+                force
+                or version != self._version
+                or now - self._loaded_at >= self.max_age
+            ):
+                self._load(version)
+
+    def names(self):
+        """Все площадки: {id: name}."""
+        self.refresh()
+        return self._names
+
+    def name(self, place_id):
+        """Название площадки или None."""
+        if place_id is None:
+            return None
+        place_id = _key(place_id)
+        name = self.names().get(place_id)
+        if name is None and time.monotonic() - self._loaded_at >= self.check_interval:
+            # Площадку могли создать в другом процессе, а версия
+            # в общем кэше еще не видна (например, LocMemCache)
+            self.refresh(force=True)
+            name = self._names.get(place_id)
+        return name
+
+    def invalidate(self):
+        """Сбрасывает кэш во всех процессах, которые видят общий кэш."""
+        try:
+            cache.incr(VERSION_KEY)
+        except ValueError:
+            cache.set(VERSION_KEY, 1, timeout=None)
+        with self._lock:
+            self._checked_at = None
+            self._version = None
+
+    def clear(self):
+        with self._lock:
+            self._names = {}
+            self._version = None
+            self._checked_at = None
+            self._loaded_at = None
+
+
+def upsert_places(places):
+    """Создает новые и переименованные площадки одним INSERT ... ON CONFLICT.
+
+    Площадки, которые уже есть с тем же названием, в базу не пишутся.
+    Что есть в базе, проверяется одним запросом, а не по кэшу: кэш
+    процесса может помнить площадку, которую уже удалили, и тогда
+    мероприятие сослалось бы на несуществующую строку.
+    Возвращает число записанных.
+    """
+    incoming = {_key(place["id"]): place["name"] for place in places}
+    if not incoming:
+        return 0
+    known = dict(Place.objects.filter(id__in=incoming).values_list("id", "name"))
+    changed = {
+        place_id: name
+        for place_id, name in incoming.items()
+        if known.get(place_id) != name
+    }
+    if not changed:
+        return 0
+
+    Place.objects.bulk_create(
+        [Place(id=place_id, name=name) for place_id, name in changed.items()],
+        update_conflicts=True,
+        unique_fields=["id"],
+        update_fields=["name"],
+    )
+    # bulk_create не отправляет сигналы
+    place_cache.invalidate()
+    return len(changed)
+
+
+place_cache = PlaceCache(
+    check_interval=settings.PLACE_CACHE_CHECK_INTERVAL,
+    max_age=settings.PLACE_CACHE_MAX_AGE,
+)
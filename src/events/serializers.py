@@ -2,7 +2,8 @@ from django.core.exceptions import ValidationError
 from django.core.validators import validate_email
 from rest_framework import serializers
 
-from src.events.models import Event, Place, Registration
+from src.events.models import ArchivedEvent, Event, Place, Registration
+from src.events.places import place_cache
 
 
 class PlaceSerializer(serializers.ModelSerializer):
@@ -15,7 +16,22 @@ class EventSerializer(serializers.ModelSerializer):
     """Сериализатор для мероприятий"""
 
     # Добавляем название площадки
-    place_name = serializers.CharField(source="place.name", read_only=True)
+    # Название берем из кэша площадок, без JOIN с Place
+    place_name = serializers.SerializerMethodField()
+    # Только при ?with_counts=1, см. EventViewSet
+    registrations_count = serializers.SerializerMethodField()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if not self.context.get("with_counts"):
+            self.fields.pop("registrations_count")
+
+    def get_place_name(self, event):
+        return place_cache.name(event.place_id)
+
+    def get_registrations_count(self, event):
+        stats = getattr(event, "stats", None)
+        return stats.registrations_count if stats else 0
 
     class Meta:
         model = Event
@@ -25,10 +41,35 @@ class EventSerializer(serializers.ModelSerializer):
             "event_time",
             "status",
             "place_name",  # Показываем название площадки
+            "registrations_count",
             # "registration_deadline",
         ]
 
 
+class ArchivedEventSerializer(serializers.ModelSerializer):
+    """Сериализатор для архивных мероприятий"""
+
+    class Meta:
+        model = ArchivedEvent
+        fields = [
+            "id",
+            "name",
+            "event_time",
+            "status",
+            "place_name",
+            "registrations_count",
+        ]
+
+
+class RegistrationListSerializer(serializers.Serializer):
+    """Участник в списке регистраций (строки приходят из values())."""
+
+    id = serializers.UUIDField(read_only=True)
+    full_name = serializers.CharField(read_only=True)
+    email = serializers.EmailField(read_only=True)
+    created_at = serializers.DateTimeField(read_only=True)
+
+
 class RegistrationSerializer(serializers.ModelSerializer):
     """Сериализатор для регистрации на мероприятие."""
 
@@ -60,12 +101,15 @@ class RegistrationSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Не указано мероприятие")
 
         # Проверяем существует ли мероприятие и открыто ли оно
-        try:
-            event = Event.objects.get(id=event_id, status="open")
-        except Event.DoesNotExist:
-            raise serializers.ValidationError(
-                "Мероприятие не найдено или закрыто для регистрации"
-            )
+        # (представление может передать уже найденное мероприятие)
+        event = self.context.get("event")
+        if event is None:
+            try:
+                event = Event.objects.get(id=event_id, status="open")
+            except Event.DoesNotExist:
+                raise serializers.ValidationError(
+                    "Мероприятие не найдено или закрыто для регистрации"
+                )
 
         # Проверяем нет ли уже регистрации
         if Registration.objects.filter(event=event, email=data["email"]).exists():
@@ -0,0 +1,29 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from src.events.models import Event, Place, Registration
+from src.events.places import place_cache
+from src.events.stats import record_registrations
+
+
+@receiver(post_save, sender=Registration)
+def increment_stats(sender, instance, created, raw=False, **kwargs):
+    # Регистрации из API, админки и ORM. bulk_create сигналов не шлет,
+    # групповая запись (src.events.coalescer) считает их сама
+    if created and not raw:
+        record_registrations(instance.event_id, instance.created_at)
+
+
+@receiver(post_delete, sender=Registration)
+def decrement_stats(sender, instance, origin=None, **kwargs):
+    # При удалении мероприятия счетчики удаляются вместе с ним
+    if isinstance(origin, Event) or getattr(origin, "model", None) is Event:
+        return
+    record_registrations(instance.event_id, instance.created_at, delta=-1)
+
+
+@receiver(post_save, sender=Place)
+@receiver(post_delete, sender=Place)
+def reset_place_cache(sender, instance, **kwargs):
+    """Сбрасываем кэш площадок при любом изменении."""
+    place_cache.invalidate()
@@ -0,0 +1,35 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from src.events.models import EventDailyStats, EventStats
+
+
+def _add(model, lookup, delta):
+    """Прибавляет delta к счетчику, создавая строку при необходимости."""
+    counter = F("registrations_count") + delta
+    if delta < 0:
+        # Не уходим ниже нуля, если счетчик уже разошелся с таблицей
+        model.objects.filter(**lookup, registrations_count__gte=-delta).update(
+            registrations_count=counter
+        )
+        return
+    if model.objects.filter(**lookup).update(registrations_count=counter):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**lookup, registrations_count=delta)
+    except IntegrityError:
+        # Строку успела создать параллельная транзакция
+        model.objects.filter(**lookup).update(registrations_count=counter)
+
+
+def record_registrations(event_id, created_at, delta=1):
+    """Обновляет счетчики мероприятия. Вызывать внутри транзакции,
+    в которой создаются или удаляются регистрации."""
+    _add(EventStats, {"event_id": event_id}, delta)
+    _add(
+        EventDailyStats,
+        {"event_id": event_id, "day": timezone.localdate(created_at)},
+        delta,
+    )
@@ -0,0 +1,19 @@
+from src.core.throttling import TokenBucketThrottle
+
+
+class EventRegisterIPThrottle(TokenBucketThrottle):
+    """Лимит регистраций с одного IP на одно мероприятие."""
+
+    scope = "event_register_ip"
+
+    def get_key(self, request, view):
+        return f"{self.get_ident(request)}:{view.kwargs.get('event_id')}"
+
+
+class EventRegisterEventThrottle(TokenBucketThrottle):
+    """Общий лимит регистраций на одно мероприятие."""
+
+    scope = "event_register_event"
+
+    def get_key(self, request, view):
+        return str(view.kwargs.get("event_id"))
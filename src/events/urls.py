@@ -1,15 +1,35 @@
 from django.urls import path
 from rest_framework.routers import DefaultRouter
 
-from src.events.views import EventRegisterView, EventViewSet
+from src.events.views import (
+    ArchivedEventViewSet,
+    EventRegisterView,
+    EventStatsView,
+    EventViewSet,
+    RegistrationExportView,
+    RegistrationListView,
+)
 
 urlpatterns = [
     path(
         "<uuid:event_id>/register/", EventRegisterView.as_view(), name="event-register"
     ),
+    path("<uuid:event_id>/stats/", EventStatsView.as_view(), name="event-stats"),
+    path(
+        "<uuid:event_id>/registrations/",
+        RegistrationListView.as_view(),
+        name="event-registrations",
+    ),
+    path(
+        "<uuid:event_id>/registrations/export/",
+        RegistrationExportView.as_view(),
+        name="event-registrations-export",
+    ),
 ]
 
 router = DefaultRouter()
+# Архив регистрируем раньше корня, иначе "archive" примут за id мероприятия
+router.register(r"archive", ArchivedEventViewSet, basename="events-archive")
 router.register(r"", EventViewSet, basename="events")  # Регистрируем по корню
 
 # Добавляем маршруты роутера В КОНЕЦ
@@ -1,24 +1,53 @@
-import json
+import logging
 import secrets
-import time
 import uuid
-from datetime import timezone
-from venv import logger
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from datetime import timedelta
 
-import requests
-from django.db import transaction
+from django.conf import settings
+from django.db import IntegrityError, OperationalError, transaction
+from django.http import StreamingHttpResponse
+from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
-from kafka import KafkaProducer
 from rest_framework import filters, status, viewsets
+from rest_framework.generics import ListAPIView
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from src.core.settings import NOTIFICATIONS_API_TOKEN, NOTIFICATIONS_OWNER_ID
-from src.events.models import Event, Registration
-from src.events.serializers import EventSerializer, RegistrationSerializer
+from src.core.circuit import Busy, CircuitOpen
+from src.core.pagination import KeysetPagination
+from src.core.throttling import EarlyThrottleMixin
+from src.events.coalescer import DuplicateRegistration, coalescer
+from src.events.export import FORMATS, export_registrations
+from src.events.models import (
+    ArchivedEvent,
+    Event,
+    EventDailyStats,
+    EventStats,
+    Registration,
+)
+from src.events.notifications import send_notification
+from src.events.serializers import (
+    ArchivedEventSerializer,
+    EventSerializer,
+    RegistrationListSerializer,
+    RegistrationSerializer,
+)
+from src.events.throttling import EventRegisterEventThrottle, EventRegisterIPThrottle
 
 from .models import OutboxMessage
 
+logger = logging.getLogger(__name__)
+
+
+class EventPagination(PageNumberPagination):
+    """Пагинация списка мероприятий: ?page=2&page_size=50."""
+
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
 
 class EventViewSet(viewsets.ReadOnlyModelViewSet):
     """
@@ -27,22 +56,66 @@ class EventViewSet(viewsets.ReadOnlyModelViewSet):
     Фильтрация по названию: ?name=концерт
     Сортировка по дате: ?ordering=event_time (по возрастанию)
     Сортировка по дате (обратная): ?ordering=-event_time
+    Число регистраций в ответе: ?with_counts=1
     """
 
     # Берем только открытые мероприятия
-    # Используем select_related чтобы избежать N+1 проблемы
-    queryset = Event.objects.filter(status="open").select_related("place")
+    # Название площадки берется из кэша площадок (src.events.places),
+    # поэтому JOIN с Place не нужен
+    queryset = Event.objects.filter(status="open")
     serializer_class = EventSerializer
+    pagination_class = EventPagination
     # Добавляем фильтрацию и сортировку
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ["name", "status", "registration_deadline"]
     ordering_fields = ["event_time"]  # Сортировка по дате
     ordering = ["event_time"]  # По умолчанию сортируем по дате
 
+    def with_counts(self):
+        return self.request.query_params.get("with_counts") in ("1", "true")
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.with_counts():
+            # Счетчик берем из EventStats тем же запросом, без COUNT на строку
+            queryset = queryset.select_related("stats")
+        return queryset
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["with_counts"] = self.with_counts()
+        return context
+
+
+class ArchivePagination(CursorPagination):
+    """Курсорная пагинация архива: без COUNT по большой таблице."""
 
-class EventRegisterView(APIView):
+    ordering = ("-event_time", "-id")
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+class ArchivedEventViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Архив прошедших мероприятий.
+    /api/events/archive/
+    /api/events/archive/<id>/
+    Фильтрация: ?name=концерт, ?event_time__gte=2025-01-01&event_time__lt=2025-02-01
+    Страницы: ?page_size=50, дальше по ссылке next
+    """
+
+    queryset = ArchivedEvent.objects.all()
+    serializer_class = ArchivedEventSerializer
+    pagination_class = ArchivePagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = {"name": ["exact"], "event_time": ["gte", "lt"]}
+
+
+class EventRegisterView(EarlyThrottleMixin, APIView):
     """Регистрации на мероприятие."""
 
+    throttle_classes = (EventRegisterIPThrottle, EventRegisterEventThrottle)
+
     def post(self, request, event_id):
         """
         POST /api/events/<event_id>/register/
@@ -65,7 +138,8 @@ class EventRegisterView(APIView):
         # Валидируем входные данные
         serializer = RegistrationSerializer(
             data=request.data,
-            context={"event_id": event_id},  # Передаём event_id для валидации
+            # Передаём уже найденное мероприятие, чтобы не искать его повторно
+            context={"event_id": event_id, "event": event},
         )
 
         if not serializer.is_valid():
@@ -73,39 +147,51 @@ class EventRegisterView(APIView):
 
         # Генерируем код подтверждения
         confirmation_code = secrets.token_hex(3).upper()
-        # Генерируем уникальный ID для уведомления
-        notification_id = uuid.uuid4()
-
-        # В одной транзакции
-        with transaction.atomic():
-            # Создаём регистрацию пользователя на мероприятие
-            registration = Registration.objects.create(
-                event=event,
-                full_name=serializer.validated_data["full_name"],
-                email=serializer.validated_data["email"],
-                confirmation_code=confirmation_code,
-            )
+        registration = Registration(
+            event=event,
+            full_name=serializer.validated_data["full_name"],
+            email=serializer.validated_data["email"],
+            confirmation_code=confirmation_code,
+        )
+        message = OutboxMessage(
+            registration=registration,
+            payload={
+                # Генерируем уникальный ID для уведомления
+                "id": str(uuid.uuid4()),  # УНИКАЛЬНЫЙ для каждого уведомления
+                "owner_id": str(settings.NOTIFICATIONS_OWNER_ID),
+                "email": registration.email,
+                "message": f"Здравствуйте, {registration.full_name}!\nВы успешно зарегистрировались на мероприятие: {event.name}.\nВаш код подтверждения: {confirmation_code}",
+            },
+        )
 
-            # Сохраняем в outbox
-            message = OutboxMessage.objects.create(
-                registration=registration,
-                payload={
-                    "id": str(notification_id),  # УНИКАЛЬНЫЙ для каждого уведомления
-                    "owner_id": str(NOTIFICATIONS_OWNER_ID),
-                    "email": registration.email,
-                    "message": f"Здравствуйте, {registration.full_name}!\nВы успешно зарегистрировались на мероприятие: {event.name}.\nВаш код подтверждения: {confirmation_code}",
-                },
+        try:
+            if settings.REGISTRATION_GROUP_COMMIT:
+                # Запись вместе с другими регистрациями процесса одной
+                # транзакцией
+                coalescer.register(registration, message)
+            else:
+                # В одной транзакции
+                with transaction.atomic():
+                    # Создаём регистрацию пользователя на мероприятие
+                    # Счетчики обновляет сигнал post_save
+                    registration.save(force_insert=True)
+                    # Сохраняем в outbox
+                    message.save(force_insert=True)
+        except (DuplicateRegistration, IntegrityError):
+            return Response(
+                {"non_field_errors": ["Вы уже зарегистрированы на это мероприятие"]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        except (OperationalError, TimeoutError, FutureTimeoutError):
+            # База занята: регистрация не записана, клиент может повторить
+            return Response(
+                {"error": "Сервис перегружен, повторите попытку позже"},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={"Retry-After": "1"},
             )
 
-        url = "https://notifications.k3scluster.tech/api/notifications"
-
-        headers = {
-            "Authorization": str(NOTIFICATIONS_API_TOKEN),
-            "Content-Type": "application/json",
-        }
         try:
-            response = requests.post(url, json=message.payload, headers=headers)
-            response.raise_for_status()
+            send_notification(message.payload)
             message.sent = True
             message.sent_at = timezone.now()
             message.save()
@@ -114,46 +200,124 @@ class EventRegisterView(APIView):
                 status=status.HTTP_201_CREATED,
             )
 
-        except Exception:
-            return Response(response, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            # Регистрация уже записана, сообщение осталось в outbox - его
+            # доставит воркер. Клиенту не нужно повторять запрос
+            if not isinstance(e, (CircuitOpen, Busy)):
+                logger.warning(f"Уведомление отложено: {e}")
+            return Response(
+                {"message": "Регистрация успешно завершена! Уведомление придет позже."},
+                status=status.HTTP_201_CREATED,
+            )
+
 
+class EventStatsView(APIView):
+    """Статистика регистраций на мероприятие."""
 
-# worker.py
-def process_outbox():
-    while True:
-        with transaction.atomic():
-            # Получаем неотправленные сообщения
-            messages = (
-                OutboxMessage.objects.filter(sent=False)
-                .select_for_update(skip_locked=True)
-                .order_by("created_at")[:100]
+    def get(self, request, event_id):
+        """
+        GET /api/events/<event_id>/stats/
+        Ограничить разбивку по дням последними N днями: ?days=30
+        """
+        stats = EventStats.objects.filter(event_id=event_id).first()
+        if stats is None and not Event.objects.filter(id=event_id).exists():
+            return Response(
+                {"error": "Мероприятие не найдено"}, status=status.HTTP_404_NOT_FOUND
+            )
+
+        daily = EventDailyStats.objects.filter(event_id=event_id)
+        days = request.query_params.get("days")
+        if days:
+            if not days.isdigit() or int(days) < 1:
+                return Response(
+                    {"error": "days должно быть положительным числом"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            since = timezone.localdate() - timedelta(days=int(days) - 1)
+            daily = daily.filter(day__gte=since)
+
+        return Response(
+            {
+                "event_id": str(event_id),
+                "registrations_count": stats.registrations_count if stats else 0,
+                "by_day": [
+                    {"day": day, "registrations_count": count}
+                    for day, count in daily.values_list("day", "registrations_count")
+                ],
+            }
+        )
+
+
+class RegistrationListPagination(KeysetPagination):
+    ordering = ("created_at", "id")
+    page_size = 50
+
+
+class RegistrationListView(ListAPIView):
+    """
+    Участники мероприятия.
+    GET /api/events/<event_id>/registrations/
+    Поиск по началу email: ?email=ivan
+    Страницы: ?page_size=100, дальше по ссылке next
+    Только для организаторов (is_staff): в списке email участников.
+    """
+
+    permission_classes = (IsAdminUser,)
+    serializer_class = RegistrationListSerializer
+    pagination_class = RegistrationListPagination
+    filter_backends = []
+
+    def get_queryset(self):
+        # Индекс (event, created_at, id); берем только нужные столбцы
+        queryset = Registration.objects.filter(event_id=self.kwargs["event_id"]).values(
+            "id", "full_name", "email", "created_at"
+        )
+        email = self.request.query_params.get("email")
+        if email:
+            queryset = queryset.filter(email__startswith=email)
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        if not Event.objects.filter(id=self.kwargs["event_id"]).exists():
+            return Response(
+                {"error": "Мероприятие не найдено"}, status=status.HTTP_404_NOT_FOUND
             )
+        return super().list(request, *args, **kwargs)
+
+
+class RegistrationExportView(APIView):
+    """Выгрузка регистраций на мероприятие потоком. В ней персональные
+    данные участников, поэтому доступна только организаторам (is_staff)."""
 
-            for message in messages:
-                try:
-                    # Создание продюсера
-                    producer = KafkaProducer(
-                        bootstrap_servers=["localhost:9092"],  # адрес Kafka-брокера
-                        value_serializer=lambda v: json.dumps(v).encode(
-                            "utf-8"
-                        ),  # сериализатор JSON
-                    )
-                    # Отправляем в Kafka/RabbitMQ/etc
-                    producer.send(
-                        "notifications_topic",
-                        value={
-                            "id": message.id,
-                            "owner_id": message.owner_id,
-                            "email": message.email,
-                            "message": message.message,
-                        },
-                    )
-
-                    # Помечаем как отправленное
-                    message.sent = True
-                    message.sent_at = timezone.now()
-                    message.save()
-                except Exception as e:
-                    logger.error(f"Failed to process message {message.id}: {e}")
-
-        time.sleep(1)  # Пауза между итерациями
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request, event_id):
+        """
+        GET /api/events/<event_id>/registrations/export/
+        Формат: ?file_format=csv (по умолчанию) или ?file_format=ndjson
+        Сжатие: ?gzip=1
+        """
+        file_format = request.query_params.get("file_format", "csv")
+        if file_format not in FORMATS:
+            return Response(
+                {"error": "Поддерживаются форматы: csv, ndjson"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not Event.objects.filter(id=event_id).exists():
+            return Response(
+                {"error": "Мероприятие не найдено"}, status=status.HTTP_404_NOT_FOUND
+            )
+
+        use_gzip = request.query_params.get("gzip") in ("1", "true")
+        content_type, extension = FORMATS[file_format]
+        filename = f"registrations-{event_id}.{extension}"
+        if use_gzip:
+            content_type = "application/gzip"
+            filename += ".gz"
+
+        response = StreamingHttpResponse(
+            export_registrations(event_id, file_format, use_gzip),
+            content_type=content_type,
+        )
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
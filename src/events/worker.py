@@ -0,0 +1,80 @@
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from src.core.metrics import outbox_batch_seconds, outbox_failures, outbox_sent
+from src.events.models import OutboxMessage
+from src.events.notifications import available, breaker, get_transport
+
+logger = logging.getLogger(__name__)
+
+
+def claim_batch(batch_size):
+    """Забирает пачку неотправленных сообщений короткой транзакцией.
+
+    Забранные сообщения помечаются claimed_until, другие воркеры их не
+    берут, пока не истечет срок. Отправка идет уже без транзакции, чтобы
+    не держать блокировку базы во время сетевых вызовов.
+    """
+    now = timezone.now()
+    free = Q(claimed_until__isnull=True) | Q(claimed_until__lt=now)
+    with transaction.atomic():
+        messages = list(
+            OutboxMessage.objects.filter(free, sent=False)
+            .select_for_update(skip_locked=True)
+            .order_by("created_at")[:batch_size]
+        )
+        if messages:
+            OutboxMessage.objects.filter(id__in=[m.id for m in messages]).update(
+                claimed_until=now + timedelta(seconds=settings.OUTBOX_CLAIM_SECONDS)
+            )
+    return messages
+
+
+def process_outbox_batch(send=None, batch_size=100):
+    """Обрабатывает одну пачку outbox. Возвращает число отправленных."""
+    send = send or get_transport()
+    # Пока сервис уведомлений недоступен, сообщения не забираем
+    if not available():
+        return 0
+    messages = claim_batch(batch_size)
+    if not messages:
+        return 0
+
+    start = time.perf_counter()
+    try:
+        sent_ids = send(messages)
+    except Exception as e:
+        outbox_failures.inc(len(messages))
+        logger.error(f"Failed to process outbox batch: {e}")
+        sent_ids = []
+
+    with transaction.atomic():
+        # Помечаем отправленные одним запросом
+        if sent_ids:
+            OutboxMessage.objects.filter(id__in=sent_ids).update(
+                sent=True, sent_at=timezone.now(), claimed_until=None
+            )
+        # Неотправленные возвращаем в очередь сразу, не дожидаясь срока
+        if len(sent_ids) < len(messages):
+            OutboxMessage.objects.filter(
+                id__in=[m.id for m in messages], sent=False
+            ).update(claimed_until=None)
+    if sent_ids:
+        outbox_sent.inc(len(sent_ids))
+    outbox_batch_seconds.observe(time.perf_counter() - start)
+    return len(sent_ids)
+
+
+def process_outbox():
+    send = get_transport()
+    while True:
+        process_outbox_batch(send)
+        # Пауза между итерациями, при разомкнутом предохранителе - до
+        # момента пробного вызова
+        time.sleep(min(max(breaker.retry_after(), 1), 30))
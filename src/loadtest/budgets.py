@@ -0,0 +1,299 @@
+import difflib
+import io
+import re
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from src.events.models import Event, OutboxMessage, Place, Registration
+from src.events.notifications import send_http
+from src.events.worker import process_outbox_batch
+from src.users_auth.tokens import CachedRefreshToken
+
+from .stubs import make_upstream_events
+
+
+@dataclass
+class Budget:
+    """Максимум SQL-запросов и времени (мс) на одну операцию."""
+
+    queries: int
+    ms: float
+
+
+# Бюджеты горячих путей. Если запросов стало больше - это регрессия
+# (N+1, повторный поиск объекта). Если меньше - бюджет можно ужесточить.
+BUDGETS = {
+    "events_list_page_10": Budget(queries=2, ms=150),
+    "events_list_page_50": Budget(queries=2, ms=250),
+    "events_list_page_100": Budget(queries=2, ms=400),
+    # +2 UPDATE счетчиков EventStats/EventDailyStats в транзакции регистрации
+    "event_register": Budget(queries=7, ms=300),
+    "auth_register": Budget(queries=3, ms=300),
+    "auth_login": Budget(queries=2, ms=300),
+    "auth_token_refresh": Budget(queries=1, ms=100),
+    "auth_logout": Budget(queries=4, ms=200),
+    # Выборка и захват пачки, затем отметка об отправке: отправка идет вне
+    # транзакции
+    "outbox_batch_100": Budget(queries=3, ms=1000),
+    # Пачкой через INSERT ... ON CONFLICT (src.sync.upsert), плюс блокировка
+    # синхронизации и отметка о примененной странице в SyncResult
+    "sync_events_1k": Budget(queries=20, ms=2000),
+}
+
+# Служебные запросы вложенных транзакций не считаем
+IGNORED_SQL = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+
+@dataclass
+class Measurement:
+    name: str
+    queries: list
+    ms: float
+
+    @property
+    def budget(self):
+        return BUDGETS[self.name]
+
+
+def normalize_sql(sql):
+    """Убирает из запроса конкретные значения, чтобы сравнивать форму."""
+    sql = re.sub(r"'(?:[^']|'')*'", "?", sql)
+    sql = re.sub(r"\b\d+(\.\d+)?\b", "?", sql)
+    sql = re.sub(r"IN \([^)]*\)", "IN (...)", sql)
+    return sql
+
+
+def measure(name, func):
+    """Выполняет func и записывает SQL-запросы и время."""
+    with CaptureQueriesContext(connection) as captured:
+        start = time.perf_counter()
+        func()
+        elapsed = (time.perf_counter() - start) * 1000
+    queries = [
+        query["sql"]
+        for query in captured.captured_queries
+        if not query["sql"].startswith(IGNORED_SQL)
+    ]
+    return Measurement(name, queries, elapsed)
+
+
+def report(measurement, baseline=None, time_scale=1.0):
+    """Текст ошибки с пронумерованными запросами и диффом с эталоном.
+
+    Возвращает None, если бюджет соблюден.
+    """
+    budget = measurement.budget
+    problems = []
+    if len(measurement.queries) > budget.queries:
+        problems.append(f"запросов {len(measurement.queries)}, бюджет {budget.queries}")
+    if measurement.ms > budget.ms * time_scale:
+        problems.append(
+            f"время {measurement.ms:.1f} мс, бюджет {budget.ms * time_scale:.0f} мс"
+        )
+    if not problems:
+        return None
+
+    lines = [f"{measurement.name}: {'; '.join(problems)}"]
+    shapes = [normalize_sql(sql) for sql in measurement.queries]
+    seen = set()
+    for i, (sql, shape) in enumerate(zip(measurement.queries, shapes), 1):
+        mark = "  (повтор)" if shape in seen else ""
+        seen.add(shape)
+        lines.append(f"  {i:>3}. {sql[:300]}{mark}")
+
+    if baseline:
+        diff = difflib.unified_diff(
+            baseline, shapes, "эталон", "сейчас", lineterm="", n=1
+        )
+        lines.extend(f"  {line}" for line in diff)
+    return "\n".join(lines)
+
+
+class _Rollback(Exception):
+    pass
+
+
+def in_rollback(func):
+    """Выполняет сценарий в транзакции, которая затем откатывается."""
+    result = []
+    try:
+        with transaction.atomic():
+            result.extend(func())
+            raise _Rollback()
+    except _Rollback:
+        pass
+    return result
+
+
+def _user_and_token(username="budget", password="budget-password"):
+    user = User.objects.create(username=username)
+    user.set_password(password)
+    user.save()
+    refresh = CachedRefreshToken.for_user(user)
+    return user, refresh
+
+
+def _create_events(count):
+    place = Place.objects.create(name="budget-place")
+    start = timezone.now() + timedelta(days=30)
+    Event.objects.bulk_create(
+        [
+            Event(
+                name=f"budget-{i}", event_time=start + timedelta(minutes=i), place=place
+            )
+            for i in range(count)
+        ]
+    )
+    return Event.objects.filter(name__startswith="budget-").first()
+
+
+def events_list_scenarios():
+    _create_events(150)
+    _, refresh = _user_and_token()
+    client = Client(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+    # Прогрев: пользователь попадает в кэш аутентификации
+    client.get("/api/events/")
+
+    results = []
+    for size in (10, 50, 100):
+        results.append(
+            measure(
+                f"events_list_page_{size}",
+                lambda size=size: _check(
+                    client.get(f"/api/events/?page_size={size}"), 200
+                ),
+            )
+        )
+    return results
+
+
+def event_register_scenarios():
+    event = _create_events(1)
+    _, refresh = _user_and_token()
+    client = Client(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+    url = f"/api/events/{event.id}/register/"
+    client.post(url, {"full_name": "Прогрев", "email": "warm@example.com"})
+
+    return [
+        measure(
+            "event_register",
+            lambda: _check(
+                client.post(url, {"full_name": "Гость", "email": "guest@example.com"}),
+                201,
+            ),
+        )
+    ]
+
+
+def auth_scenarios():
+    client = Client()
+    password = "budget-password"
+    # Прогрев кэша черного списка
+    _, warm = _user_and_token("budget-warm", password)
+    client.post("/api/auth/token/refresh/", {"refresh": str(warm)})
+
+    results = [
+        measure(
+            "auth_register",
+            lambda: _check(
+                client.post(
+                    "/api/auth/register/",
+                    {"username": "budget-new", "password": password},
+                ),
+                201,
+            ),
+        )
+    ]
+
+    _, refresh = _user_and_token("budget", password)
+    results.append(
+        measure(
+            "auth_login",
+            lambda: _check(
+                client.post(
+                    "/api/auth/login/", {"username": "budget", "password": password}
+                ),
+                200,
+            ),
+        )
+    )
+    results.append(
+        measure(
+            "auth_token_refresh",
+            lambda: _check(
+                client.post("/api/auth/token/refresh/", {"refresh": str(refresh)}),
+                200,
+            ),
+        )
+    )
+
+    client.cookies["refresh_token"] = str(refresh)
+    auth = f"Bearer {refresh.access_token}"
+    client.get("/api/events/", HTTP_AUTHORIZATION=auth)
+    results.append(
+        measure(
+            "auth_logout",
+            lambda: _check(
+                client.post("/api/auth/logout/", HTTP_AUTHORIZATION=auth), 200
+            ),
+        )
+    )
+    return results
+
+
+def outbox_scenarios():
+    event = _create_events(1)
+    registrations = Registration.objects.bulk_create(
+        [
+            Registration(event=event, full_name=f"Гость {i}", email=f"g{i}@example.com")
+            for i in range(100)
+        ]
+    )
+    OutboxMessage.objects.bulk_create(
+        [
+            OutboxMessage(
+                registration=registration,
+                payload={"id": str(uuid.uuid4()), "email": registration.email},
+            )
+            for registration in registrations
+        ]
+    )
+    # NOTIFICATIONS_API_URL указывает на заглушку
+    return [
+        measure(
+            "outbox_batch_100", lambda: process_outbox_batch(send_http, batch_size=100)
+        )
+    ]
+
+
+def sync_scenarios():
+    return [
+        measure(
+            "sync_events_1k",
+            lambda: call_command("sync_events", stdout=io.StringIO()),
+        )
+    ]
+
+
+UPSTREAM_EVENTS = 1000
+
+
+def upstream_events():
+    return make_upstream_events(UPSTREAM_EVENTS)
+
+
+def _check(response, expected_status):
+    if response.status_code != expected_status:
+        raise AssertionError(
+            f"{response.request['PATH_INFO']}: ожидался {expected_status}, "
+            f"получен {response.status_code}: {response.content[:300]!r}"
+        )
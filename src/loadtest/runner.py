@@ -0,0 +1,221 @@
+import io
+import subprocess
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+import requests
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management import call_command
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.utils import timezone
+
+from src.events.models import Event, Place
+from src.users_auth.tokens import CachedRefreshToken
+
+SEED_PREFIX = "loadtest-"
+LOADTEST_USER = "loadtest"
+LOADTEST_PASSWORD = "loadtest-password"
+
+
+def percentile(values, p):
+    """Перцентиль по методу nearest-rank для отсортированного списка."""
+    if not values:
+        return 0.0
+    index = max(0, min(len(values) - 1, round(p / 100 * len(values)) - 1))
+    return values[index]
+
+
+def count_errors(statuses):
+    """Ошибки - ответы 4xx/5xx и исключения (записаны по имени класса)."""
+    return sum(
+        count
+        for code, count in statuses.items()
+        if code != "ok" and (not isinstance(code, int) or code >= 400)
+    )
+
+
+def summarize(name, latencies, statuses, duration, **extra):
+    """Сводка сценария в машиночитаемом виде (времена в миллисекундах)."""
+    latencies = sorted(latencies)
+    return {
+        "scenario": name,
+        "requests": len(latencies),
+        "errors": count_errors(statuses),
+        "status_codes": {str(code): count for code, count in statuses.items()},
+        "duration_s": round(duration, 3),
+        "throughput_rps": round(len(latencies) / duration, 2) if duration else 0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2) if latencies else 0,
+        **extra,
+    }
+
+
+def run_http(name, make_request, total, concurrency):
+    """Выполняет total запросов в concurrency потоков.
+
+    make_request(session, i) возвращает requests.Response.
+    """
+    local = threading.local()
+    latencies = []
+    statuses = Counter()
+    lock = threading.Lock()
+
+    def one(i):
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        start = time.perf_counter()
+        try:
+            code = make_request(local.session, i).status_code
+        except requests.RequestException as e:
+            code = type(e).__name__
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+            statuses[code] += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(total)))
+    duration = time.perf_counter() - start
+
+    return summarize(name, latencies, statuses, duration, concurrency=concurrency)
+
+
+class _QuietRequestHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class AppServer:
+    """Приложение Django в многопоточном WSGI-сервере на свободном порту."""
+
+    def __init__(self):
+        self._server = ThreadedWSGIServer(("127.0.0.1", 0), _QuietRequestHandler)
+        self._server.set_app(WSGIHandler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def seed(count):
+    """Создает count мероприятий и пользователя для нагрузки.
+
+    Возвращает (id горячего мероприятия, access токен). Данные предыдущего
+    прогона (с префиксом loadtest-) удаляются.
+    """
+    Event.objects.filter(name__startswith=SEED_PREFIX).delete()
+    Place.objects.filter(name__startswith=SEED_PREFIX).delete()
+
+    place = Place.objects.create(name=f"{SEED_PREFIX}place")
+    start = timezone.now() + timedelta(days=30)
+    Event.objects.bulk_create(
+        [
+            Event(
+                name=f"{SEED_PREFIX}{i}",
+                event_time=start + timedelta(minutes=i),
+                place=place,
+            )
+            for i in range(count)
+        ],
+        batch_size=1000,
+    )
+    hot = Event.objects.create(name=f"{SEED_PREFIX}hot", event_time=start, place=place)
+
+    user, _ = User.objects.get_or_create(username=LOADTEST_USER)
+    user.set_password(LOADTEST_PASSWORD)
+    user.save()
+    token = str(CachedRefreshToken.for_user(user).access_token)
+    return hot.id, token
+
+
+def cleanup():
+    """Удаляет пользователя нагрузочного теста: его пароль известен."""
+    User.objects.filter(username=LOADTEST_USER).delete()
+
+
+def events_list(base_url, token, total, concurrency, pages):
+    headers = {"Authorization": f"Bearer {token}"}
+
+    def request(session, i):
+        page = i % pages + 1
+        return session.get(f"{base_url}/api/events/?page={page}", headers=headers)
+
+    return run_http("events_list", request, total, concurrency)
+
+
+def register_burst(base_url, token, total, concurrency, event_id):
+    headers = {"Authorization": f"Bearer {token}"}
+    run_id = uuid.uuid4().hex[:8]
+
+    def request(session, i):
+        return session.post(
+            f"{base_url}/api/events/{event_id}/register/",
+            json={"full_name": f"Гость {i}", "email": f"lt-{run_id}-{i}@example.com"},
+            headers=headers,
+        )
+
+    return run_http("register_burst", request, total, concurrency)
+
+
+def login_storm(base_url, total, concurrency):
+    def request(session, i):
+        return session.post(
+            f"{base_url}/api/auth/login/",
+            json={"username": LOADTEST_USER, "password": LOADTEST_PASSWORD},
+        )
+
+    return run_http("login_storm", request, total, concurrency)
+
+
+def sync_runs(runs, upstream_events):
+    latencies = []
+    statuses = Counter()
+    start = time.perf_counter()
+    for _ in range(runs):
+        run_start = time.perf_counter()
+        try:
+            call_command("sync_events", stdout=io.StringIO())
+            statuses["ok"] += 1
+        except Exception as e:
+            statuses[type(e).__name__] += 1
+        latencies.append(time.perf_counter() - run_start)
+    duration = time.perf_counter() - start
+
+    result = summarize("sync_events", latencies, statuses, duration)
+    result["upstream_events"] = upstream_events
+    result["events_per_second"] = (
+        round(upstream_events * runs / duration, 2) if duration else 0
+    )
+    return result
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
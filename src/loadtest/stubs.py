@@ -0,0 +1,123 @@
+import json
+import random
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def make_upstream_events(count, places=50, seed=0):
+    """Генерирует мероприятия в формате внешнего API events."""
+    rnd = random.Random(seed)
+    place_list = [
+        {"id": str(uuid.UUID(int=rnd.getrandbits(128))), "name": f"Площадка {i}"}
+        for i in range(places)
+    ]
+    start = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    return [
+        {
+            "id": str(uuid.UUID(int=rnd.getrandbits(128))),
+            "name": f"loadtest-upstream-{i}",
+            "event_time": (start + timedelta(hours=i)).isoformat(),
+            "status": "open",
+            "place": rnd.choice(place_list),
+        }
+        for i in range(count)
+    ]
+
+
+class StubServer:
+    """HTTP-заглушка внешнего сервиса в отдельном потоке.
+
+    latency - задержка каждого ответа в секундах,
+    error_rate - доля ответов 503 (от 0 до 1).
+    """
+
+    def __init__(self, handler, latency=0.0, error_rate=0.0, seed=0):
+        self.handler = handler
+        self.latency = latency
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _dispatch(self):
+                with stub._lock:
+                    stub.requests += 1
+                    fail = stub.random.random() < stub.error_rate
+                if stub.latency:
+                    time.sleep(stub.latency)
+                if fail:
+                    return self._reply(503, {"error": "stub error"})
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                status, payload = stub.handler(self.command, self.path, body)
+                return self._reply(status, payload)
+
+            def _reply(self, status, payload):
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = _dispatch
+            do_POST = _dispatch
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def events_stub(events, page_size=None, **kwargs):
+    """Заглушка events.k3scluster.tech: GET /api/events/?page=N."""
+    page_size = page_size or max(len(events), 1)
+    server = None
+
+    def handler(method, path, body):
+        query = parse_qs(urlparse(path).query)
+        page = int(query.get("page", ["1"])[0])
+        start = (page - 1) * page_size
+        results = events[start : start + page_size]
+        has_next = start + page_size < len(events)
+        return 200, {
+            "count": len(events),
+            "next": f"{server.url}/api/events/?page={page + 1}" if has_next else None,
+            "previous": None,
+            "results": results,
+        }
+
+    server = StubServer(handler, **kwargs)
+    return server
+
+
+def notifications_stub(**kwargs):
+    """Заглушка notifications.k3scluster.tech: POST /api/notifications."""
+
+    def handler(method, path, body):
+        return 201, {"status": "queued"}
+
+    return StubServer(handler, **kwargs)
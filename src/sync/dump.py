@@ -0,0 +1,135 @@
+"""Потоковое чтение выгрузок мероприятий.
+
+Поддерживаются NDJSON (одно мероприятие на строку), массив мероприятий
+и формат внешнего API ({"count": ..., "results": [...]}), в том числе
+несколько страниц подряд и сжатые gzip. В памяти держится только
+текущий кусок файла и одно мероприятие.
+"""
+
+import gzip
+import json
+
+CHUNK_SIZE = 64 * 1024
+WHITESPACE = " \t\r\n"
+DELIMITERS = WHITESPACE + ",:]}"
+
+
+def open_dump(path):
+    """Открывает файл как текст, распаковывая gzip по сигнатуре."""
+    with open(path, "rb") as f:
+        magic = f.read(2)
+    if magic == b"\x1f\x8b":
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, encoding="utf-8")
+
+
+class _Stream:
+    """Чтение JSON-значений по одному через JSONDecoder.raw_decode."""
+
+    def __init__(self, fp, chunk_size=CHUNK_SIZE):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        data = self.fp.read(self.chunk_size)
+        if not data:
+            self.eof = True
+            return
+        self.buf = self.buf[self.pos :] + data
+        self.pos = 0
+
+    def peek(self):
+        """Следующий значимый символ ("" в конце файла)."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if self.eof:
+                return ""
+            self._fill()
+
+    def expect(self, char):
+        if self.peek() != char:
+            context = self.buf[self.pos : self.pos + 50]
+            raise ValueError(f"Ожидался {char!r}, получено {context!r}")
+        self.pos += 1
+
+    def value(self):
+        """Декодирует одно значение, дочитывая файл, если оно не поместилось."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+                self._fill()
+                continue
+            # Число на границе куска могло оборваться: "12" вместо "123"
+            # или "1" вместо "1.5", поэтому после него ждем разделитель
+            cut = end == len(self.buf) or (
+                not isinstance(value, (dict, list, str))
+                and self.buf[end] not in DELIMITERS
+            )
+            if cut and not self.eof:
+                self._fill()
+                continue
+            self.pos = end
+            return value
+
+    def array(self):
+        """Элементы массива по одному."""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+            self.expect("]")
+            return
+
+    def top_object(self):
+        """Объект верхнего уровня. Если в нем есть "results" - это
+        страница внешнего API, и отдаются ее мероприятия. Иначе объект
+        сам является мероприятием (NDJSON)."""
+        self.expect("{")
+        fields = {}
+        page = False
+        while self.peek() != "}":
+            key = self.value()
+            self.expect(":")
+            if key == "results" and self.peek() == "[":
+                page = True
+                yield from self.array()
+            else:
+                fields[key] = self.value()
+            if self.peek() == ",":
+                self.pos += 1
+        self.pos += 1
+        if not page:
+            yield fields
+
+
+def iter_events(fp):
+    """Мероприятия из файла в формате внешнего API, по одному."""
+    stream = _Stream(fp)
+    while True:
+        char = stream.peek()
+        if char == "":
+            return
+        if char == "[":
+            yield from stream.array()
+        elif char == "{":
+            yield from stream.top_object()
+        else:
+            # Число, строка и т.п. вместо мероприятия: отдаем как есть,
+            # его отбросит проверка строки
+            yield stream.value()
@@ -0,0 +1,64 @@
+import os
+import socket
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from src.sync.models import JobLease
+
+
+def make_owner():
+    """Уникальное имя владельца аренды: хост, процесс и случайный суффикс."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def acquire(name, owner, ttl):
+    """Пытается взять аренду name на ttl секунд.
+
+    Удается, если аренды нет, она истекла или уже принадлежит owner.
+    Решение принимает база (INSERT или условный UPDATE), поэтому
+    из нескольких процессов и серверов аренду получит только один.
+    """
+    now = timezone.now()
+    expires_at = now + timedelta(seconds=ttl)
+    updated = (
+        JobLease.objects.filter(name=name)
+        .filter(Q(expires_at__lte=now) | Q(owner=owner))
+        .update(owner=owner, expires_at=expires_at)
+    )
+    if updated:
+        return True
+    try:
+        with transaction.atomic():
+            JobLease.objects.create(name=name, owner=owner, expires_at=expires_at)
+    except IntegrityError:
+        # Аренда есть и ее держит кто-то другой
+        return False
+    return True
+
+
+def release(name, owner, hold=0):
+    """Отпускает аренду. С hold > 0 аренда остается за owner еще hold
+    секунд, чтобы другие экземпляры не повторили задачу раньше срока."""
+    JobLease.objects.filter(name=name, owner=owner).update(
+        expires_at=timezone.now() + timedelta(seconds=hold)
+    )
+
+
+@contextmanager
+def lease(name, ttl, owner=None):
+    """with lease("sync_events", ttl=600) as acquired:
+    if not acquired:
+        return  # задачу уже выполняет другой процесс
+    """
+    owner = owner or make_owner()
+    acquired = acquire(name, owner, ttl)
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            release(name, owner)
@@ -0,0 +1,127 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Что импортирует процесс при старте
+ENTRY_POINTS = {
+    # gunicorn: WSGI-приложение и все представления из urls.py
+    "web": (
+        "from src.core.wsgi import application\n"
+        "from django.urls import get_resolver\n"
+        "get_resolver().url_patterns\n"
+    ),
+    # manage.py run_outbox_worker
+    "worker": (
+        "import django\n"
+        "django.setup()\n"
+        "from src.sync.management.commands import run_outbox_worker\n"
+    ),
+}
+
+# Тяжелые пакеты, которые веб-процессу загружать не нужно. requests и
+# urllib3 в веб-процесс все равно попадают: их импортирует
+# rest_framework/compat.py (import requests в try/except), если пакет
+# установлен. coreapi тут ни при чем.
+WATCHED = ("kafka", "requests", "urllib3")
+
+PROBE = """
+import json, os, resource, sys, time
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "src.core.settings")
+start = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "watched": sorted(
+        name for name in {watched!r} if name in sys.modules
+    ),
+}}))
+"""
+
+
+def parse_importtime(stderr):
+    """Разбирает вывод -X importtime: {пакет верхнего уровня: мкс}."""
+    cumulative = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # import time:   self [us] |   cumulative |  пакет
+        _, total_us, name = line.split("|")
+        # Вложенные импорты выводятся с дополнительным отступом
+        if name.startswith("  "):
+            continue
+        cumulative[name.strip()] = int(total_us)
+    return cumulative
+
+
+def probe(code):
+    """Запускает чистый интерпретатор с -X importtime и возвращает
+    время, пиковый RSS, загруженные тяжелые пакеты и вклад пакетов."""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            PROBE.format(code=code, watched=WATCHED),
+        ],
+        cwd=settings.BASE_DIR.parent,
+        env=os.environ.copy(),
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise CommandError(result.stderr[-2000:])
+    data = json.loads(result.stdout.strip().splitlines()[-1])
+    data["imports"] = parse_importtime(result.stderr)
+    return data
+
+
+class Command(BaseCommand):
+    """uv run manage.py bench_imports
+    uv run manage.py bench_imports --repeat 5 --top 15
+    uv run manage.py bench_imports --json imports.json
+
+    Меряет холодный старт веб-процесса и воркера outbox: время импорта,
+    пиковую память (RSS) и самые тяжелые пакеты по данным
+    python -X importtime. Каждый замер - в новом интерпретаторе."""
+
+    help = "Время импорта и память при старте веб-процесса и воркера"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--repeat", type=int, default=3, help="Число замеров (берется лучший)"
+        )
+        parser.add_argument(
+            "--top", type=int, default=10, help="Сколько тяжелых пакетов показать"
+        )
+        parser.add_argument("--json", help="Сохранить результат в файл")
+
+    def handle(self, *args, **options):
+        report = {}
+        for name, code in ENTRY_POINTS.items():
+            runs = [probe(code) for _ in range(options["repeat"])]
+            best = min(runs, key=lambda run: run["seconds"])
+            report[name] = best
+
+            self.stdout.write(
+                f"{name:<8} старт {best['seconds'] * 1000:>7.1f} мс  "
+                f"RSS {best['rss_kb'] / 1024:>6.1f} МБ  "
+                f"загружены: {', '.join(best['watched']) or '-'}"
+            )
+            heaviest = sorted(best["imports"].items(), key=lambda item: -item[1])
+            for module, us in heaviest[: options["top"]]:
+                self.stdout.write(f"    {us / 1000:>7.1f} мс  {module}")
+
+        if "kafka" in report["web"]["watched"]:
+            self.stdout.write(self.style.WARNING("Веб-процесс загружает kafka"))
+
+        if options["json"]:
+            with open(options["json"], "w") as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(f"Результат сохранен в {options['json']}")
@@ -0,0 +1,99 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.core.management.base import BaseCommand
+
+from src.users_auth.hashing import HashingExecutor
+
+PASSWORD = "correct horse battery staple"
+
+
+def measure(check, seconds):
+    """Вызывает check() в цикле seconds секунд, возвращает число вызовов."""
+    count = 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        check()
+        count += 1
+    return count
+
+
+class Command(BaseCommand):
+    """uv run manage.py bench_password_hashing
+    uv run manage.py bench_password_hashing --seconds 5 --workers 4 --json
+
+    Сколько входов в секунду выдерживает один процесс (на одно ядро)
+    и пул хэширования для каждого доступного алгоритма."""
+
+    help = "Бенчмарк проверки паролей: входов в секунду на ядро"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--seconds", type=float, default=3, help="Длительность замера"
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=settings.PASSWORD_HASHING_WORKERS or 1,
+            help="Размер пула процессов",
+        )
+        parser.add_argument(
+            "--json", action="store_true", help="Вывести результат в JSON"
+        )
+
+    def handle(self, *args, **options):
+        seconds = options["seconds"]
+        workers = options["workers"]
+        results = []
+
+        for hasher in hashers.get_hashers():
+            try:
+                encoded = hashers.make_password(PASSWORD, hasher=hasher.algorithm)
+            except ValueError:
+                # Нет нужной библиотеки (например, argon2-cffi)
+                continue
+
+            def check():
+                hashers.verify_password(PASSWORD, encoded)
+
+            # Один процесс, одно ядро
+            single = measure(check, seconds) / seconds
+
+            # Через пул: столько потоков, сколько процессов в пуле
+            executor = HashingExecutor(workers=workers, max_pending=workers)
+            executor.run(hashers.verify_password, PASSWORD, encoded)  # прогрев
+
+            def pool_check():
+                executor.run(hashers.verify_password, PASSWORD, encoded)
+
+            with ThreadPoolExecutor(max_workers=workers) as threads:
+                counts = threads.map(
+                    lambda _: measure(pool_check, seconds), range(workers)
+                )
+                pooled = sum(counts) / seconds
+            executor.shutdown()
+
+            results.append(
+                {
+                    "algorithm": hasher.algorithm,
+                    "logins_per_second_single": round(single, 2),
+                    "workers": workers,
+                    "logins_per_second_pool": round(pooled, 2),
+                    "logins_per_second_per_core": round(pooled / workers, 2),
+                }
+            )
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        for row in results:
+            self.stdout.write(
+                f"{row['algorithm']}: {row['logins_per_second_single']} входов/с "
+                f"на одном ядре, {row['logins_per_second_pool']} входов/с "
+                f"в пуле из {workers} процессов "
+                f"({row['logins_per_second_per_core']} на ядро)"
+            )
@@ -0,0 +1,117 @@
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import (
+    override_settings,
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+
+from src.events.places import place_cache
+from src.loadtest import budgets
+from src.loadtest.stubs import events_stub, notifications_stub
+from src.users_auth import hashing
+from src.users_auth.blacklist import blacklist_cache
+
+
+class Command(BaseCommand):
+    """uv run manage.py check_perf_budgets
+    uv run manage.py check_perf_budgets --record perf_baseline.json
+    uv run manage.py check_perf_budgets --baseline perf_baseline.json
+
+    Проверяет, что горячие пути укладываются в бюджет SQL-запросов
+    и времени. Работает на отдельной тестовой базе с заглушками внешних
+    сервисов. При превышении выводит список запросов и дифф с эталоном
+    (--baseline) и завершается с ошибкой."""
+
+    help = "Проверка бюджетов SQL-запросов и времени для горячих эндпоинтов"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--baseline", help="JSON с эталонными запросами")
+        parser.add_argument("--record", help="Сохранить текущие запросы как эталон")
+        parser.add_argument(
+            "--time-scale",
+            type=float,
+            default=1.0,
+            help="Множитель бюджетов времени (для медленных машин)",
+        )
+
+    def handle(self, *args, **options):
+        baseline = {}
+        if options["baseline"]:
+            with open(options["baseline"]) as f:
+                baseline = json.load(f)
+
+        events_server = events_stub(budgets.upstream_events()).start()
+        notifications_server = notifications_stub().start()
+        notifications_url = f"{notifications_server.url}/api/notifications"
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        # Хэширование паролей меряет bench_password_hashing,
+        # здесь считаем только накладные расходы представлений
+        old_executor = hashing.executor
+        hashing.executor = hashing.HashingExecutor(workers=0, max_pending=16)
+
+        try:
+            with override_settings(
+                EVENTS_API_URL=f"{events_server.url}/api/events/",
+                NOTIFICATIONS_API_URL=notifications_url,
+                PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+                REST_FRAMEWORK={
+                    **settings.REST_FRAMEWORK,
+                    "DEFAULT_THROTTLE_RATES": {},
+                },
+            ):
+                measurements = []
+                for scenario in (
+                    budgets.events_list_scenarios,
+                    budgets.event_register_scenarios,
+                    budgets.auth_scenarios,
+                    budgets.outbox_scenarios,
+                    budgets.sync_scenarios,
+                ):
+                    cache.clear()
+                    blacklist_cache.clear()
+                    place_cache.clear()
+                    measurements.extend(budgets.in_rollback(scenario))
+        finally:
+            hashing.executor = old_executor
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+            events_server.stop()
+            notifications_server.stop()
+
+        failures = []
+        for measurement in measurements:
+            budget = measurement.budget
+            error = budgets.report(
+                measurement, baseline.get(measurement.name), options["time_scale"]
+            )
+            status = "OK" if error is None else "ПРЕВЫШЕН"
+            self.stdout.write(
+                f"{measurement.name:<24} запросов {len(measurement.queries):>5}"
+                f"/{budget.queries:<5} время {measurement.ms:>8.1f}"
+                f"/{budget.ms * options['time_scale']:.0f} мс  {status}"
+            )
+            if error:
+                failures.append(error)
+
+        if options["record"]:
+            with open(options["record"], "w") as f:
+                json.dump(
+                    {
+                        m.name: [budgets.normalize_sql(sql) for sql in m.queries]
+                        for m in measurements
+                    },
+                    f,
+                    indent=2,
+                    ensure_ascii=False,
+                )
+            self.stdout.write(f"Эталон сохранен в {options['record']}")
+
+        if failures:
+            raise CommandError("Бюджеты превышены:\n\n" + "\n\n".join(failures))
@@ -3,19 +3,35 @@ from datetime import timedelta
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 
-from src.events.models import Event
+from src.core.metrics import old_events_deleted
+from src.events.archive import archive_events
 
 
 class Command(BaseCommand):
-    """uv run manage.py delete_old_events."""
+    """uv run manage.py delete_old_events
+    uv run manage.py delete_old_events --days 30 --chunk-size 500
 
-    help = "Удаляет мероприятия, закончившиеся более 7 дней назад"
+    Мероприятия не удаляются насовсем, а вместе с регистрациями
+    переносятся в архив (ArchivedEvent, ArchivedRegistration), который
+    отдает /api/events/archive/."""
 
-    def handle(self, *args, **options):
-        delete_time = timezone.now() - timedelta(days=7)
-        old_events = Event.objects.filter(event_time__lt=delete_time)
+    help = "Переносит в архив мероприятия, закончившиеся более 7 дней назад"
 
-        count = old_events.count()
-        old_events.delete()
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days", type=int, default=7, help="Сколько дней мероприятие не трогаем"
+        )
+        parser.add_argument(
+            "--chunk-size", type=int, default=200, help="Мероприятий в одной пачке"
+        )
 
-        print(f"Удалено {count} мероприятий")
+    def handle(self, *args, **options):
+        delete_time = timezone.now() - timedelta(days=options["days"])
+        events, registrations = archive_events(
+            delete_time, chunk_size=options["chunk_size"]
+        )
+        old_events_deleted.inc(events)
+
+        self.stdout.write(
+            f"Перенесено в архив {events} мероприятий и {registrations} регистраций"
+        )
@@ -0,0 +1,41 @@
+import sys
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+
+from src.events.export import FORMATS, export_registrations
+from src.events.models import Event
+
+
+class Command(BaseCommand):
+    """uv run manage.py export_registrations <event_id>
+    uv run manage.py export_registrations <event_id> --format ndjson --gzip \\
+        --output registrations.ndjson.gz"""
+
+    help = "Выгружает регистрации на мероприятие в CSV или NDJSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument("event_id", help="id мероприятия")
+        parser.add_argument(
+            "--format", choices=sorted(FORMATS), default="csv", help="Формат файла"
+        )
+        parser.add_argument("--gzip", action="store_true", help="Сжать в gzip")
+        parser.add_argument("--output", help="Файл (по умолчанию stdout)")
+
+    def handle(self, *args, **options):
+        try:
+            event_id = uuid.UUID(options["event_id"])
+        except ValueError:
+            raise CommandError(f"Некорректный id мероприятия: {options['event_id']}")
+        if not Event.objects.filter(id=event_id).exists():
+            raise CommandError(f"Мероприятие {event_id} не найдено")
+
+        chunks = export_registrations(event_id, options["format"], options["gzip"])
+        if options["output"]:
+            with open(options["output"], "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+        else:
+            for chunk in chunks:
+                sys.stdout.buffer.write(chunk)
+            sys.stdout.buffer.flush()
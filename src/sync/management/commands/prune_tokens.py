@@ -0,0 +1,67 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+
+
+class Command(BaseCommand):
+    """uv run manage.py prune_tokens
+    uv run manage.py prune_tokens --chunk-size 500 --pause 0.1
+
+    Можно запускать по расписанию (cron). Удаление идет пачками,
+    каждая пачка в своей короткой транзакции, поэтому таблицы
+    не блокируются надолго."""
+
+    help = "Удаляет просроченные токены из outstanding и черного списка"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size", type=int, default=1000, help="Размер пачки для удаления"
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0.05,
+            help="Пауза между пачками в секундах",
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        pause = options["pause"]
+
+        start = time.monotonic()
+        now = timezone.now()
+        outstanding_removed = 0
+        blacklisted_removed = 0
+
+        while True:
+            # Берем очередную пачку просроченных токенов (индекс по expires_at)
+            ids = list(
+                OutstandingToken.objects.filter(expires_at__lt=now)
+                .order_by("id")
+                .values_list("id", flat=True)[:chunk_size]
+            )
+            if not ids:
+                break
+
+            with transaction.atomic():
+                deleted, _ = BlacklistedToken.objects.filter(token_id__in=ids).delete()
+                blacklisted_removed += deleted
+                deleted, _ = OutstandingToken.objects.filter(id__in=ids).delete()
+                outstanding_removed += deleted
+
+            if len(ids) < chunk_size:
+                break
+            # Даем другим запросам поработать с таблицами
+            time.sleep(pause)
+
+        elapsed = time.monotonic() - start
+        self.stdout.write(
+            f"Удалено токенов: outstanding {outstanding_removed}, "
+            f"в черном списке {blacklisted_removed} за {elapsed:.2f} с"
+        )
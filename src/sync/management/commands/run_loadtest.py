@@ -0,0 +1,228 @@
+import json
+import math
+import os
+import platform
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from src.loadtest import runner
+from src.loadtest.stubs import events_stub, make_upstream_events, notifications_stub
+
+SCENARIOS = [
+    "events_list",
+    "register_burst",
+    "register_group_commit",
+    "login_storm",
+    "sync_events",
+]
+
+
+class Command(BaseCommand):
+    """Нагрузочный тест с заглушками внешних сервисов.
+
+    Команда создает тестовые данные, поэтому запускать ее нужно
+    на отдельной базе:
+    SQLITE_PATH=/tmp/loadtest.sqlite3 uv run manage.py migrate
+    SQLITE_PATH=/tmp/loadtest.sqlite3 uv run manage.py run_loadtest \\
+        --events 10000 --output results.json
+    uv run manage.py run_loadtest --scenarios sync_events --latency 0.05
+
+    Проверка конкурентной записи регистраций (ни одного ответа 5xx):
+    SQLITE_PATH=/tmp/loadtest.sqlite3 uv run manage.py run_loadtest \
+        --scenarios register_burst,register_group_commit --fail-on-errors"""
+
+    help = "Нагрузочный тест API и синхронизации, результат в JSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--events", type=int, default=1000, help="Сколько мероприятий создать"
+        )
+        parser.add_argument(
+            "--requests", type=int, default=500, help="Запросов на сценарий"
+        )
+        parser.add_argument(
+            "--concurrency", type=int, default=16, help="Параллельных клиентов"
+        )
+        parser.add_argument(
+            "--scenarios",
+            default=",".join(SCENARIOS),
+            help=f"Сценарии через запятую: {', '.join(SCENARIOS)}",
+        )
+        parser.add_argument(
+            "--upstream-events",
+            type=int,
+            default=1000,
+            help="Сколько мероприятий отдает заглушка events",
+        )
+        parser.add_argument(
+            "--upstream-page-size",
+            type=int,
+            default=None,
+            help="Размер страницы заглушки events (по умолчанию все на одной)",
+        )
+        parser.add_argument(
+            "--sync-runs", type=int, default=3, help="Сколько раз запустить sync"
+        )
+        parser.add_argument(
+            "--latency",
+            type=float,
+            default=0.0,
+            help="Задержка ответов заглушек в секундах",
+        )
+        parser.add_argument(
+            "--error-rate",
+            type=float,
+            default=0.0,
+            help="Доля ответов 503 от заглушек (0..1)",
+        )
+        parser.add_argument(
+            "--base-url",
+            help="Адрес уже запущенного сервера (по умолчанию поднимается свой)",
+        )
+        parser.add_argument(
+            "--keep-throttling",
+            action="store_true",
+            help="Не отключать ограничение частоты запросов",
+        )
+        parser.add_argument(
+            "--fail-on-errors",
+            action="store_true",
+            help="Завершиться с ошибкой, если в сценариях были ошибки",
+        )
+        parser.add_argument(
+            "--i-know",
+            action="store_true",
+            help="Запустить на основной базе (без SQLITE_PATH)",
+        )
+        parser.add_argument("--output", help="Файл для результата в JSON")
+
+    def handle(self, *args, **options):
+        # Команда создает мероприятия и пользователя с известным паролем,
+        # поэтому на основной базе запускается только явно
+        if not os.getenv("SQLITE_PATH") and not options["i_know"]:
+            raise CommandError(
+                "Задайте отдельную базу через SQLITE_PATH "
+                "(или --i-know, чтобы запустить на основной)"
+            )
+
+        scenarios = [name.strip() for name in options["scenarios"].split(",")]
+        unknown = set(scenarios) - set(SCENARIOS)
+        if unknown:
+            raise CommandError(f"Неизвестные сценарии: {', '.join(sorted(unknown))}")
+
+        stub_options = {
+            "latency": options["latency"],
+            "error_rate": options["error_rate"],
+        }
+        upstream = make_upstream_events(options["upstream_events"])
+        events_server = events_stub(
+            upstream, page_size=options["upstream_page_size"], **stub_options
+        ).start()
+        notifications_server = notifications_stub(**stub_options).start()
+
+        overrides = {
+            "EVENTS_API_URL": f"{events_server.url}/api/events/",
+            "NOTIFICATIONS_API_URL": f"{notifications_server.url}/api/notifications",
+        }
+        if not options["keep_throttling"]:
+            overrides["REST_FRAMEWORK"] = {
+                **settings.REST_FRAMEWORK,
+                "DEFAULT_THROTTLE_RATES": {},
+            }
+
+        app_server = None
+        try:
+            with override_settings(**overrides):
+                hot_event_id, token = runner.seed(options["events"])
+                self.stdout.write(f"Создано мероприятий: {options['events']}")
+
+                base_url = options["base_url"]
+                if base_url is None:
+                    app_server = runner.AppServer().start()
+                    base_url = app_server.url
+
+                results = self.run_scenarios(
+                    scenarios, options, base_url, token, hot_event_id
+                )
+        finally:
+            if app_server is not None:
+                app_server.stop()
+            events_server.stop()
+            notifications_server.stop()
+            runner.cleanup()
+
+        report = {
+            "revision": runner.git_revision(),
+            "created_at": timezone.now().isoformat(),
+            "python": platform.python_version(),
+            "database": settings.DATABASES["default"]["ENGINE"],
+            "config": {
+                key: options[key]
+                for key in (
+                    "events",
+                    "requests",
+                    "concurrency",
+                    "upstream_events",
+                    "upstream_page_size",
+                    "sync_runs",
+                    "latency",
+                    "error_rate",
+                )
+            },
+            "results": results,
+        }
+
+        for result in results:
+            self.stdout.write(
+                f"{result['scenario']}: {result['throughput_rps']} rps, "
+                f"p50 {result['p50_ms']} мс, p95 {result['p95_ms']} мс, "
+                f"p99 {result['p99_ms']} мс, ошибок {result['errors']}"
+            )
+
+        data = json.dumps(report, indent=2, ensure_ascii=False)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(data)
+            self.stdout.write(f"Результат сохранен в {options['output']}")
+        else:
+            self.stdout.write(data)
+
+        failed = [result["scenario"] for result in results if result["errors"]]
+        if options["fail_on_errors"] and failed:
+            raise CommandError(f"Ошибки в сценариях: {', '.join(failed)}")
+
+    def run_scenarios(self, scenarios, options, base_url, token, hot_event_id):
+        total = options["requests"]
+        concurrency = options["concurrency"]
+        pages = max(
+            1, math.ceil(options["events"] / settings.REST_FRAMEWORK["PAGE_SIZE"])
+        )
+        results = []
+
+        for name in scenarios:
+            self.stdout.write(f"Сценарий {name}...")
+            if name == "events_list":
+                result = runner.events_list(base_url, token, total, concurrency, pages)
+            elif name == "register_burst":
+                result = runner.register_burst(
+                    base_url, token, total, concurrency, hot_event_id
+                )
+            elif name == "register_group_commit":
+                # Та же нагрузка с групповой записью регистраций
+                with override_settings(REGISTRATION_GROUP_COMMIT=True):
+                    result = runner.register_burst(
+                        base_url, token, total, concurrency, hot_event_id
+                    )
+                result["scenario"] = name
+            elif name == "login_storm":
+                result = runner.login_storm(base_url, total, concurrency)
+            else:
+                result = runner.sync_runs(
+                    options["sync_runs"], options["upstream_events"]
+                )
+            results.append(result)
+
+        return results
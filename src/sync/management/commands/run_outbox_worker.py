@@ -4,7 +4,7 @@ import sys
 
 from django.core.management.base import BaseCommand
 
-from src.events.views import process_outbox
+from src.events.worker import process_outbox
 
 
 class Command(BaseCommand):
@@ -0,0 +1,63 @@
+import signal
+
+from django.core.management.base import BaseCommand, CommandError
+
+from src.sync.scheduler import JOBS, Scheduler
+
+
+class Command(BaseCommand):
+    """uv run manage.py run_scheduler
+    uv run manage.py run_scheduler --only sync_events --only prune_tokens
+    uv run manage.py run_scheduler --once
+
+    Заменяет отдельные запуски sync_events, delete_old_events
+    и prune_tokens из cron: Django загружается один раз, а задачи
+    выполняются по интервалам из SCHEDULER_INTERVALS. Можно запускать
+    на нескольких серверах: каждую задачу выполняет один экземпляр."""
+
+    help = "Запускает периодические задачи в одном процессе"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--only",
+            action="append",
+            choices=sorted(JOBS),
+            help="Запускать только указанные задачи",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Выполнить все задачи один раз и завершиться",
+        )
+
+    def handle(self, *args, **options):
+        names = options["only"] or list(JOBS)
+        scheduler = Scheduler(JOBS[name] for name in names)
+
+        if options["once"]:
+            failed = []
+            for job in scheduler.jobs:
+                run = scheduler.run_job(job)
+                if run is None:
+                    self.stdout.write(f"{job.name}: выполняется другим экземпляром")
+                    continue
+                status = "OK" if run.success else "ОШИБКА"
+                self.stdout.write(f"{job.name}: {status} за {run.duration:.2f} с")
+                if not run.success:
+                    failed.append(job.name)
+            if failed:
+                raise CommandError(f"Задачи завершились с ошибкой: {', '.join(failed)}")
+            return
+
+        # Текущая задача доработает, после чего цикл завершится
+        def stop(sig, frame):
+            self.stdout.write(self.style.WARNING("Остановка планировщика"))
+            scheduler.stopped = True
+
+        signal.signal(signal.SIGINT, stop)
+        signal.signal(signal.SIGTERM, stop)
+
+        self.stdout.write(
+            f"Планировщик {scheduler.owner} запущен, задачи: {', '.join(names)}"
+        )
+        scheduler.run_forever()
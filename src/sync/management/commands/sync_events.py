@@ -1,71 +1,230 @@
+import time
+
 import requests
-from django.core.management.base import BaseCommand
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import F
+
+from src.core.metrics import sync_added, sync_duration, sync_updated
+from src.sync.dump import iter_events, open_dump
+from src.sync.locks import acquire, lease, make_owner
+from src.sync.models import SyncResult
+from src.sync.upsert import apply_batch, check_event
 
-from src.core.settings import NOTIFICATIONS_API_TOKEN
-from src.events.models import Event, Place
+# Сколько ошибок загрузки из файла сохранять в SyncResult.errors
+MAX_ERRORS = 1000
+# Не "sync_events": под этим именем задачу берет в аренду планировщик
+SYNC_LOCK = "sync_events:run"
 
 
 class Command(BaseCommand):
     """Примеры команд
     uv run manage.py sync_events - обычная синхронизация
     uv run manage.py sync_events --all - полная синхронизация
-    uv run manage.py sync_events --date 2024-01-20 - синхронизация по дате."""
+    uv run manage.py sync_events --date 2024-01-20 - синхронизация по дате.
+    uv run manage.py sync_events --resume - продолжить прерванную синхронизацию
+    uv run manage.py sync_events --from-file dump.ndjson.gz - загрузка из файла
+    (NDJSON, массив или ответы внешнего API, можно сжатые gzip)."""
 
     help = "Синхронизирует мероприятия"
 
     def add_arguments(self, parser):
         parser.add_argument("--all", action="store_true", help="Полная синхронизация")
         parser.add_argument("--date", type=str, help="Дата для синхронизации")
+        parser.add_argument("--from-file", help="Загрузить мероприятия из файла")
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Продолжить прерванную синхронизацию с последней страницы",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Мероприятий в одной транзакции при загрузке из файла",
+        )
+
+    def import_file(self, path, batch_size, owner):
+        """Загрузка из выгрузки без обращения к внешнему API.
+
+        Некорректные строки не прерывают загрузку: они пропускаются
+        и записываются в SyncResult.errors (не больше MAX_ERRORS).
+        """
+        start = time.perf_counter()
+        reported = start
+        rows = added = updated = 0
+        batch = []
+        result = SyncResult.objects.create(status="running", source="file")
+
+        def skip(row, error):
+            result.skipped_count += 1
+            if len(result.errors) < MAX_ERRORS:
+                result.errors.append({"row": row, "error": str(error)})
+
+        def flush():
+            nonlocal added, updated
+            try:
+                batch_added, batch_updated = apply_batch([event for _, event in batch])
+            except Exception:
+                # Ищем строку, которую не приняла база, и применяем
+                # остальные по одной
+                batch_added = batch_updated = 0
+                for row, event in batch:
+                    try:
+                        row_added, row_updated = apply_batch([event])
+                    except Exception as e:
+                        skip(row, e)
+                    else:
+                        batch_added += row_added
+                        batch_updated += row_updated
+            added += batch_added
+            updated += batch_updated
+            batch.clear()
+            if not acquire(SYNC_LOCK, owner, settings.SYNC_LOCK_TTL):
+                raise RuntimeError("Блокировка синхронизации потеряна")
+
+        try:
+            with open_dump(path) as f:
+                for event in iter_events(f):
+                    rows += 1
+                    try:
+                        check_event(event)
+                    except (ValueError, TypeError) as e:
+                        skip(rows, e)
+                        continue
+                    batch.append((rows, event))
+                    if len(batch) >= batch_size:
+                        flush()
+                        now = time.perf_counter()
+                        if now - reported >= 1:
+                            reported = now
+                            self.stdout.write(
+                                f"Загружено {rows} строк, "
+                                f"{rows / (now - start):.0f} строк/с"
+                            )
+                if batch:
+                    flush()
+        except Exception as e:
+            # Файл не дочитан (битый JSON, нет файла): то, что успели
+            # загрузить, остается, запуск отмечается как прерванный
+            result.status = "failed"
+            self._save_result(result, added, updated)
+            raise CommandError(f"Ошибка в строке {rows}: {e}") from e
+
+        elapsed = time.perf_counter() - start
+        result.status = "done"
+        self._save_result(result, added, updated)
+        sync_duration.observe(elapsed)
+        self.stdout.write(
+            f"Готово! Добавлено: {added}, Обновлено: {updated}, "
+            f"пропущено некорректных: {result.skipped_count}. "
+            f"{rows} строк за {elapsed:.1f} с ({rows / max(elapsed, 1e-9):.0f} строк/с)"
+        )
+
+    def _save_result(self, result, added, updated):
+        result.added_count = added
+        result.updated_count = updated
+        result.save(
+            update_fields=[
+                "status",
+                "added_count",
+                "updated_count",
+                "skipped_count",
+                "errors",
+            ]
+        )
+        sync_added.inc(added)
+        sync_updated.inc(updated)
 
     def handle(self, *args, **options):
+        # Вторая синхронизация или загрузка из файла, запущенная
+        # параллельно (cron, планировщик на другом сервере, ручной
+        # запуск), сразу завершается
+        owner = make_owner()
+        with lease(SYNC_LOCK, settings.SYNC_LOCK_TTL, owner=owner) as acquired:
+            if not acquired:
+                self.stdout.write("Синхронизация уже выполняется, пропускаем.")
+                return
+            if options["from_file"]:
+                self.import_file(options["from_file"], options["batch_size"], owner)
+            else:
+                self.sync(owner, options["resume"])
+
+    def sync(self, owner, resume):
         headers = {
-            "Authorization": NOTIFICATIONS_API_TOKEN,
+            "Authorization": settings.NOTIFICATIONS_API_TOKEN,
             "Content-Type": "application/json",
         }
         # Печатаем сообщение начала команды
         print("Начало синхронизации.")
 
-        # URL внешнего API
-        url = "https://events.k3scluster.tech/api/events/"
+        result = None
+        if resume:
+            last = SyncResult.objects.filter(source="poll").first()
+            if not (last and last.status != "done" and last.cursor):
+                self.stdout.write("Прерванной синхронизации нет, начинаем сначала.")
+            elif last.resume_attempts >= settings.SYNC_MAX_RESUME_ATTEMPTS:
+                # Страница раз за разом не загружается: начинаем заново
+                self.stdout.write(
+                    f"Не удалось продолжить с {last.cursor} "
+                    f"за {last.resume_attempts} попыток, начинаем сначала."
+                )
+            else:
+                result = last
+                self.stdout.write(f"Продолжаем с {result.cursor}")
+        if result is None:
+            # URL внешнего API
+            result = SyncResult.objects.create(
+                status="running", cursor=settings.EVENTS_API_URL
+            )
+        else:
+            result.status = "running"
+            result.resume_attempts += 1
+            result.save(update_fields=["status", "resume_attempts"])
 
+        start = time.perf_counter()
+        added = updated = 0
+        url = result.cursor
         try:
-            # Делаем запрос к внешнему API
-            response = requests.get(url, headers=headers)
-
-            # Преобразуем ответ в JSON
-            events = response.json()
-            added = 0
-            updated = 0
-
-            # 3. Для каждого мероприятия в ответе
-            for event in events.get("results"):
-                # Создаем или находим площадку
-                place = None
-                # Если есть информация о площадке
-                if event.get("place"):
-                    place, _ = Place.objects.get_or_create(
-                        id=event["place"]["id"],
-                        defaults={"name": event["place"]["name"]},
+            while url:
+                # Делаем запрос к внешнему API
+                response = requests.get(
+                    url, headers=headers, timeout=settings.SYNC_REQUEST_TIMEOUT
+                )
+                response.raise_for_status()
+                page = response.json()
+                url = page.get("next") or ""
+
+                # Площадки и мероприятия страницы применяются вместе с
+                # отметкой о ней: после сбоя --resume продолжит со
+                # следующей страницы, ничего не пропустив
+                with transaction.atomic():
+                    page_added, page_updated = apply_batch(page.get("results") or [])
+                    SyncResult.objects.filter(pk=result.pk).update(
+                        added_count=F("added_count") + page_added,
+                        updated_count=F("updated_count") + page_updated,
+                        cursor=url,
+                        resume_attempts=0,
                     )
+                added += page_added
+                updated += page_updated
 
-                # Создаем или обновляем мероприятие
-                _, created = Event.objects.update_or_create(
-                    id=event["id"],
-                    defaults={
-                        "name": event["name"],
-                        "event_time": event["event_time"],
-                        "status": event["status"],
-                        "place": place,
-                    },
-                )
-                if created:
-                    added += 1
-                else:
-                    updated += 1
+                if url and not acquire(SYNC_LOCK, owner, settings.SYNC_LOCK_TTL):
+                    raise RuntimeError("Блокировка синхронизации потеряна")
+
+            SyncResult.objects.filter(pk=result.pk).update(status="done")
+            sync_duration.observe(time.perf_counter() - start)
+            sync_added.inc(added)
+            sync_updated.inc(updated)
 
             # 4. Показываем результат
             self.stdout.write(f"Готово! Добавлено: {added}, Обновлено: {updated}")
 
         except Exception as e:
             # Если ошибка
-            self.stdout.write(f"Ошибка: {e}")
+            SyncResult.objects.filter(pk=result.pk).update(status="failed")
+            sync_added.inc(added)
+            sync_updated.inc(updated)
+            # Планировщик и cron должны увидеть, что синхронизация не удалась
+            raise CommandError(f"Ошибка: {e}") from e
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("sync", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="JobLease",
+            fields=[
+                (
+                    "name",
+                    models.CharField(max_length=100, primary_key=True, serialize=False),
+                ),
+                ("owner", models.CharField(max_length=200)),
+                ("expires_at", models.DateTimeField()),
+            ],
+            options={
+                "verbose_name": "Аренда задачи",
+                "verbose_name_plural": "Аренды задач",
+            },
+        ),
+        migrations.CreateModel(
+            name="JobRun",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("job", models.CharField(max_length=100)),
+                ("owner", models.CharField(max_length=200)),
+                ("started_at", models.DateTimeField()),
+                (
+                    "duration",
+                    models.FloatField(default=0, verbose_name="Длительность, сек."),
+                ),
+                ("success", models.BooleanField(default=False)),
+                ("error", models.TextField(blank=True)),
+            ],
+            options={
+                "verbose_name": "Запуск задачи",
+                "verbose_name_plural": "Запуски задач",
+                "ordering": ["-started_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["job", "-started_at"], name="sync_jobrun_job_34a010_idx"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("sync", "0002_job_lease_jobrun"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="syncresult",
+            name="batch_id",
+            field=models.CharField(
+                blank=True,
+                max_length=100,
+                null=True,
+                unique=True,
+                verbose_name="ID пачки",
+            ),
+        ),
+        migrations.AddField(
+            model_name="syncresult",
+            name="source",
+            field=models.CharField(
+                choices=[("poll", "Опрос API"), ("webhook", "Webhook")],
+                default="poll",
+                max_length=20,
+                verbose_name="Источник",
+            ),
+        ),
+    ]
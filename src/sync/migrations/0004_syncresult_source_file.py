@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("sync", "0003_syncresult_batch_id"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="syncresult",
+            name="source",
+            field=models.CharField(
+                choices=[
+                    ("poll", "Опрос API"),
+                    ("webhook", "Webhook"),
+                    ("file", "Файл"),
+                ],
+                default="poll",
+                max_length=20,
+                verbose_name="Источник",
+            ),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("sync", "0004_syncresult_source_file"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="syncresult",
+            name="cursor",
+            field=models.URLField(
+                blank=True, max_length=2000, verbose_name="Следующая страница"
+            ),
+        ),
+        migrations.AddField(
+            model_name="syncresult",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("running", "Выполняется"),
+                    ("done", "Завершена"),
+                    ("failed", "Прервана"),
+                ],
+                default="done",
+                max_length=20,
+                verbose_name="Статус",
+            ),
+        ),
+    ]
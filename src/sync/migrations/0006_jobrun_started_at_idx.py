@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("sync", "0005_syncresult_cursor"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="jobrun",
+            index=models.Index(
+                fields=["started_at"], name="sync_jobrun_started_54354f_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-19 20:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("sync", "0006_jobrun_started_at_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="syncresult",
+            name="errors",
+            field=models.JSONField(blank=True, default=list, verbose_name="Ошибки"),
+        ),
+        migrations.AddField(
+            model_name="syncresult",
+            name="skipped_count",
+            field=models.IntegerField(default=0, verbose_name="Пропущено строк"),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-19 20:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("sync", "0007_syncresult_errors"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="syncresult",
+            name="resume_attempts",
+            field=models.IntegerField(default=0, verbose_name="Попыток продолжения"),
+        ),
+    ]
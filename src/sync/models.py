@@ -9,6 +9,37 @@ class SyncResult(models.Model):
     )
     added_count = models.IntegerField(default=0, verbose_name="Добавлено мероприятий")
     updated_count = models.IntegerField(default=0, verbose_name="Обновлено мероприятий")
+    # Идентификатор пачки webhook: повторная доставка не применяется
+    batch_id = models.CharField(
+        max_length=100, unique=True, null=True, blank=True, verbose_name="ID пачки"
+    )
+    source = models.CharField(
+        max_length=20,
+        choices=[("poll", "Опрос API"), ("webhook", "Webhook"), ("file", "Файл")],
+        default="poll",
+        verbose_name="Источник",
+    )
+    # Полная синхронизация по страницам: после каждой примененной
+    # страницы здесь сохраняется адрес следующей (sync_events --resume)
+    status = models.CharField(
+        max_length=20,
+        choices=[
+            ("running", "Выполняется"),
+            ("done", "Завершена"),
+            ("failed", "Прервана"),
+        ],
+        default="done",
+        verbose_name="Статус",
+    )
+    cursor = models.URLField(
+        max_length=2000, blank=True, verbose_name="Следующая страница"
+    )
+    # Сколько раз подряд продолжали с cursor без продвижения
+    resume_attempts = models.IntegerField(default=0, verbose_name="Попыток продолжения")
+    # Загрузка из файла: некорректные строки пропускаются и
+    # записываются сюда ({"row": номер, "error": текст})
+    skipped_count = models.IntegerField(default=0, verbose_name="Пропущено строк")
+    errors = models.JSONField(default=list, blank=True, verbose_name="Ошибки")
 
     class Meta:
         verbose_name = "Результат синхронизации"
@@ -17,3 +48,43 @@ class SyncResult(models.Model):
 
     def __str__(self):
         return f"Результат синхронизации {self.sync_date}"
+
+
+class JobLease(models.Model):
+    """Аренда задачи планировщика: задачу выполняет только владелец
+    аренды, пока она не истекла."""
+
+    name = models.CharField(max_length=100, primary_key=True)
+    owner = models.CharField(max_length=200)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "Аренда задачи"
+        verbose_name_plural = "Аренды задач"
+
+    def __str__(self):
+        return f"{self.name} ({self.owner} до {self.expires_at})"
+
+
+class JobRun(models.Model):
+    """Запуск задачи планировщика."""
+
+    job = models.CharField(max_length=100)
+    owner = models.CharField(max_length=200)
+    started_at = models.DateTimeField()
+    duration = models.FloatField(default=0, verbose_name="Длительность, сек.")
+    success = models.BooleanField(default=False)
+    error = models.TextField(blank=True)
+
+    class Meta:
+        verbose_name = "Запуск задачи"
+        verbose_name_plural = "Запуски задач"
+        ordering = ["-started_at"]
+        indexes = [
+            models.Index(fields=["job", "-started_at"]),
+            # Удаление старой истории (prune_job_runs)
+            models.Index(fields=["started_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.job} {self.started_at}"
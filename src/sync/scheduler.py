@@ -0,0 +1,208 @@
+import io
+import logging
+import random
+import time
+import traceback
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Callable
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import close_old_connections, connection
+from django.utils import timezone
+
+from src.core.metrics import registry, scheduler_job_duration, scheduler_job_failures
+from src.events.models import OutboxMessage
+from src.sync.locks import acquire, make_owner, release
+from src.sync.models import JobRun
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Job:
+    """Периодическая задача. Интервал берется из SCHEDULER_INTERVALS."""
+
+    name: str
+    func: Callable
+    # Сколько секунд держим аренду на время выполнения.
+    # Должно быть больше самого долгого запуска задачи.
+    lease_ttl: float = 30 * 60
+
+    @property
+    def interval(self):
+        return settings.SCHEDULER_INTERVALS[self.name]
+
+
+JOBS = {}
+
+
+def job(name, lease_ttl=30 * 60):
+    """Регистрирует функцию как задачу планировщика."""
+
+    def decorator(func):
+        JOBS[name] = Job(name, func, lease_ttl)
+        return func
+
+    return decorator
+
+
+def _command(name, *args):
+    """Запускает команду manage.py в текущем процессе, вывод - в лог."""
+    out = io.StringIO()
+    call_command(name, *args, stdout=out)
+    for line in out.getvalue().splitlines():
+        logger.info("%s: %s", name, line)
+
+
+@job("sync_events")
+def sync_events():
+    # Прерванная синхронизация продолжается со своей страницы
+    _command("sync_events", "--resume")
+
+
+@job("delete_old_events")
+def delete_old_events():
+    _command("delete_old_events")
+
+
+@job("prune_tokens")
+def prune_tokens():
+    _command("prune_tokens")
+
+
+def _delete_in_chunks(queryset, chunk_size):
+    """Удаляет строки queryset пачками по chunk_size, каждая пачка в своей
+    короткой транзакции. Возвращает число удаленных."""
+    removed = 0
+    while True:
+        ids = list(queryset.values_list("pk", flat=True)[:chunk_size])
+        if not ids:
+            break
+        deleted, _ = queryset.model.objects.filter(pk__in=ids).delete()
+        removed += deleted
+        if len(ids) < chunk_size:
+            break
+    return removed
+
+
+@job("compact_outbox")
+def compact_outbox(chunk_size=1000):
+    """Удаляет отправленные сообщения outbox старше OUTBOX_RETENTION_DAYS."""
+    before = timezone.now() - timedelta(days=settings.OUTBOX_RETENTION_DAYS)
+    # Индекс (sent, created_at)
+    removed = _delete_in_chunks(
+        OutboxMessage.objects.filter(sent=True, created_at__lt=before), chunk_size
+    )
+    logger.info("compact_outbox: удалено сообщений %s", removed)
+    return removed
+
+
+@job("prune_job_runs")
+def prune_job_runs(chunk_size=1000):
+    """Удаляет историю запусков задач старше JOB_RUN_RETENTION_DAYS."""
+    before = timezone.now() - timedelta(days=settings.JOB_RUN_RETENTION_DAYS)
+    removed = _delete_in_chunks(
+        JobRun.objects.filter(started_at__lt=before), chunk_size
+    )
+    logger.info("prune_job_runs: удалено запусков %s", removed)
+    return removed
+
+
+@job("analyze_db")
+def analyze_db():
+    """Обновляет статистику планировщика SQLite (sqlite_stat1).
+
+    По ней оцениваются размеры таблиц в админке (EstimatedCountPaginator)
+    и выбираются индексы. Первый раз выполняется полный ANALYZE, дальше
+    PRAGMA optimize пересчитывает только изменившиеся таблицы.
+    В PostgreSQL статистику обновляет autovacuum.
+    """
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'"
+        )
+        if cursor.fetchone() is None:
+            cursor.execute("ANALYZE")
+        else:
+            cursor.execute("PRAGMA optimize")
+    logger.info("analyze_db: статистика обновлена")
+
+
+class Scheduler:
+    """Запускает задачи по интервалам в одном процессе.
+
+    Перед запуском задача берет аренду в базе (src.sync.locks), поэтому
+    при нескольких экземплярах планировщика задачу выполняет один из них.
+    После запуска аренда удерживается почти до следующего запуска, чтобы
+    другие экземпляры не повторили задачу раньше срока.
+    """
+
+    def __init__(self, jobs, owner=None):
+        self.jobs = list(jobs)
+        self.owner = owner or make_owner()
+        self.stopped = False
+        now = time.monotonic()
+        # Первый запуск сразу, но со сдвигом, чтобы узлы не стартовали разом
+        self.next_run = {
+            job.name: now + random.uniform(0, self.jitter(job)) for job in self.jobs
+        }
+
+    def jitter(self, job):
+        return job.interval * settings.SCHEDULER_JITTER
+
+    def run_pending(self):
+        """Выполняет задачи, время которых пришло."""
+        for job in self.jobs:
+            if self.stopped:
+                break
+            if self.next_run[job.name] <= time.monotonic():
+                self.run_job(job)
+                jitter = self.jitter(job)
+                self.next_run[job.name] = (
+                    time.monotonic() + job.interval + random.uniform(-jitter, jitter)
+                )
+
+    def run_job(self, job):
+        """Выполняет задачу под арендой. Возвращает JobRun или None,
+        если задачу сейчас выполняет другой экземпляр."""
+        close_old_connections()
+        if not acquire(job.name, self.owner, job.lease_ttl):
+            logger.info("%s: выполняется другим экземпляром, пропускаем", job.name)
+            return None
+
+        started_at = timezone.now()
+        start = time.perf_counter()
+        error = ""
+        try:
+            job.func()
+        except Exception:
+            error = traceback.format_exc()
+            scheduler_job_failures.inc(job=job.name)
+            logger.exception("%s: ошибка", job.name)
+        duration = time.perf_counter() - start
+        scheduler_job_duration.observe(duration, job=job.name)
+        registry.flush()
+
+        run = JobRun.objects.create(
+            job=job.name,
+            owner=self.owner,
+            started_at=started_at,
+            duration=duration,
+            success=not error,
+            error=error,
+        )
+        hold = job.interval - self.jitter(job) - duration
+        release(job.name, self.owner, hold=max(hold, 0))
+        logger.info("%s: завершено за %.2f с", job.name, duration)
+        return run
+
+    def run_forever(self, tick=1.0):
+        while not self.stopped:
+            self.run_pending()
+            wait = min(self.next_run.values()) - time.monotonic()
+            if wait > 0:
+                time.sleep(min(wait, tick))
@@ -0,0 +1,35 @@
+from django.conf import settings
+from rest_framework import serializers
+
+from src.events.models import EventStatus
+
+
+class UpstreamPlaceSerializer(serializers.Serializer):
+    id = serializers.UUIDField()
+    name = serializers.CharField(max_length=255)
+
+
+class UpstreamEventSerializer(serializers.Serializer):
+    """Мероприятие в формате внешнего API."""
+
+    id = serializers.UUIDField()
+    name = serializers.CharField(max_length=255)
+    event_time = serializers.DateTimeField()
+    status = serializers.ChoiceField(choices=EventStatus.choices)
+    place = UpstreamPlaceSerializer(allow_null=True, required=False)
+
+
+class WebhookBatchSerializer(serializers.Serializer):
+    """Пачка изменений от внешнего API."""
+
+    batch_id = serializers.CharField(max_length=100)
+    events = UpstreamEventSerializer(many=True, required=False, default=list)
+    places = UpstreamPlaceSerializer(many=True, required=False, default=list)
+
+    def validate(self, data):
+        size = len(data["events"]) + len(data["places"])
+        if size > settings.SYNC_WEBHOOK_MAX_ITEMS:
+            raise serializers.ValidationError(
+                f"В пачке больше {settings.SYNC_WEBHOOK_MAX_ITEMS} изменений"
+            )
+        return data
@@ -0,0 +1,30 @@
+import hashlib
+import hmac
+import time
+
+from django.conf import settings
+
+
+def sign(body, timestamp, secret=None):
+    """Подпись тела запроса: HMAC-SHA256 от "<timestamp>.<body>"."""
+    secret = secret or settings.SYNC_WEBHOOK_SECRET
+    message = f"{timestamp}.".encode() + body
+    return "sha256=" + hmac.new(secret.encode(), message, hashlib.sha256).hexdigest()
+
+
+def verify(body, timestamp, signature):
+    """Проверяет подпись webhook. Возвращает текст ошибки или None."""
+    if not settings.SYNC_WEBHOOK_SECRET:
+        return "Webhook не настроен"
+    if not timestamp or not signature:
+        return "Нет подписи"
+    try:
+        age = abs(time.time() - int(timestamp))
+    except ValueError:
+        return "Неверная метка времени"
+    # Старые запросы не принимаем, чтобы их нельзя было повторить
+    if age > settings.SYNC_WEBHOOK_TOLERANCE:
+        return "Истек срок подписи"
+    if not hmac.compare_digest(sign(body, timestamp), signature):
+        return "Неверная подпись"
+    return None
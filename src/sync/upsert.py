@@ -0,0 +1,89 @@
+import uuid
+
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
+
+from src.events.models import Event, EventStatus
+from src.events.places import upsert_places
+
+EVENT_FIELDS = ["name", "event_time", "status", "place", "changed_at"]
+
+
+def _place_id(item):
+    place = item.get("place")
+    return place["id"] if place else None
+
+
+def check_event(event):
+    """Быстрая проверка мероприятия из выгрузки (без сериализатора DRF).
+
+    Выбрасывает ValueError с описанием первой найденной ошибки.
+    """
+    if not isinstance(event, dict):
+        raise ValueError("ожидался объект")
+    missing = {"id", "name", "event_time", "status"} - event.keys()
+    if missing:
+        raise ValueError(f"нет полей: {', '.join(sorted(missing))}")
+    _check_uuid(event["id"], "id мероприятия")
+    if not isinstance(event["name"], str) or not 0 < len(event["name"]) <= 255:
+        raise ValueError("некорректное название")
+    if not isinstance(event["event_time"], str) or not parse_datetime(
+        event["event_time"]
+    ):
+        raise ValueError(f"некорректная дата: {event['event_time']!r}")
+    if event["status"] not in EventStatus.values:
+        raise ValueError(f"неизвестный статус: {event['status']!r}")
+    place = event.get("place")
+    if place is not None:
+        if not isinstance(place, dict) or not isinstance(place.get("name"), str):
+            raise ValueError("некорректная площадка")
+        _check_uuid(place.get("id"), "id площадки")
+
+
+def _check_uuid(value, what):
+    try:
+        uuid.UUID(str(value))
+    except ValueError:
+        raise ValueError(f"некорректный {what}: {value!r}") from None
+
+
+def upsert_events(events):
+    """Создает или обновляет мероприятия в формате внешнего API
+    (площадка вложена в мероприятие). Возвращает (добавлено, обновлено).
+
+    Вместо get_or_create/update_or_create на каждое мероприятие:
+    один COUNT существующих и INSERT ... ON CONFLICT мероприятий.
+    Площадки пишутся, только если они новые или переименованы.
+    """
+    if not events:
+        return 0, 0
+    # При повторах id в пачке побеждает последнее изменение
+    unique = {str(event["id"]): event for event in events}
+    upsert_places([event["place"] for event in unique.values() if event.get("place")])
+
+    updated = Event.objects.filter(id__in=list(unique)).count()
+    Event.objects.bulk_create(
+        [
+            Event(
+                id=event["id"],
+                name=event["name"],
+                event_time=event["event_time"],
+                status=event["status"],
+                place_id=_place_id(event),
+            )
+            for event in unique.values()
+        ],
+        update_conflicts=True,
+        unique_fields=["id"],
+        update_fields=EVENT_FIELDS,
+        batch_size=500,
+    )
+    return len(unique) - updated, updated
+
+
+def apply_batch(events, places=()):
+    """Применяет пачку изменений в одной транзакции."""
+    with transaction.atomic():
+        if places:
+            upsert_places(places)
+        return upsert_events(events)
@@ -0,0 +1,7 @@
+from django.urls import path
+
+from src.sync.views import SyncWebhookView
+
+urlpatterns = [
+    path("webhook/", SyncWebhookView.as_view(), name="sync-webhook"),
+]
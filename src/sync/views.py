@@ -0,0 +1,79 @@
+import json
+
+from django.db import IntegrityError, transaction
+from rest_framework import status
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from src.core.metrics import sync_added, sync_updated
+from src.sync.models import SyncResult
+from src.sync.serializers import WebhookBatchSerializer
+from src.sync.signing import verify
+from src.sync.upsert import apply_batch
+
+
+class SyncWebhookView(APIView):
+    """Прием изменений мероприятий и площадок от внешнего API."""
+
+    # Вместо JWT запрос подписывается общим секретом
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def post(self, request):
+        """
+        POST /api/sync/webhook/
+        Заголовки:
+            X-Sync-Timestamp: 1767225600
+            X-Sync-Signature: sha256=<HMAC-SHA256 от "<timestamp>.<тело>">
+
+        Пример тела:
+        {
+            "batch_id": "2026-01-01T00:00:00-0001",
+            "events": [{"id": "...", "name": "...", "event_time": "...",
+                        "status": "open", "place": {"id": "...", "name": "..."}}],
+            "places": [{"id": "...", "name": "..."}]
+        }
+        Повторная пачка с тем же batch_id не применяется.
+        """
+        body = request.body
+        error = verify(
+            body,
+            request.headers.get("X-Sync-Timestamp"),
+            request.headers.get("X-Sync-Signature"),
+        )
+        if error:
+            return Response({"error": error}, status=status.HTTP_403_FORBIDDEN)
+
+        try:
+            data = json.loads(body)
+        except ValueError:
+            return Response(
+                {"error": "Тело должно быть JSON"}, status=status.HTTP_400_BAD_REQUEST
+            )
+        serializer = WebhookBatchSerializer(data=data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        batch = serializer.validated_data
+
+        try:
+            with transaction.atomic():
+                # Уникальный batch_id: параллельная доставка той же пачки
+                # упрется в ограничение и не применится второй раз
+                result = SyncResult.objects.create(
+                    batch_id=batch["batch_id"], source="webhook"
+                )
+                added, updated = apply_batch(batch["events"], batch["places"])
+                result.added_count = added
+                result.updated_count = updated
+                result.save(update_fields=["added_count", "updated_count"])
+        except IntegrityError:
+            if not SyncResult.objects.filter(batch_id=batch["batch_id"]).exists():
+                raise
+            return Response({"batch_id": batch["batch_id"], "status": "duplicate"})
+
+        sync_added.inc(added)
+        sync_updated.inc(updated)
+        return Response(
+            {"batch_id": batch["batch_id"], "added": added, "updated": updated}
+        )
@@ -1,8 +1,12 @@
 from django.contrib import admin
 from django.urls import include, path
 
+from src.core.metrics import metrics_view
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/auth/", include("src.users_auth.urls")),
     path("api/events/", include("src.events.urls")),
+    path("api/sync/", include("src.sync.urls")),
+    path("metrics", metrics_view),
 ]
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class AuthConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "src.users_auth"
+
+    def ready(self):
+        from src.core import checks  # noqa: F401
+
+        from . import signals  # noqa: F401
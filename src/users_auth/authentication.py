@@ -0,0 +1,70 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from src.core.cache import is_shared
+
+
+def user_cache_ttl():
+    """Срок жизни пользователя в кэше.
+
+    Сброс кэша при изменении пользователя виден другим процессам только
+    через общий кэш. С кэшем в памяти процесса (LocMemCache) срок
+    ограничен AUTH_USER_CACHE_LOCAL_TTL: столько секунд отключенный
+    пользователь или старый пароль еще принимаются другими воркерами.
+    """
+    ttl = settings.AUTH_USER_CACHE_TTL
+    if not is_shared():
+        ttl = min(ttl, settings.AUTH_USER_CACHE_LOCAL_TTL)
+    return ttl
+
+
+def user_cache_key(user_id):
+    return f"auth:user:{user_id}"
+
+
+def invalidate_user(user_id):
+    """Удаляет пользователя из кэша (вызывается при сохранении/удалении)."""
+    cache.delete(user_cache_key(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT-аутентификация с кэшированием пользователя.
+
+    Пользователь ищется в кэше по user_id из токена, в БД идем только
+    при промахе. Запись живет user_cache_ttl() секунд и сбрасывается
+    сигналами при сохранении или удалении пользователя.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            ) from e
+
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            # Полная проверка из simplejwt (запрос к БД)
+            user = super().get_user(validated_token)
+            cache.set(key, user, user_cache_ttl())
+            return user
+
+        # Для пользователя из кэша повторяем те же проверки
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(
+                _("The user's password has been changed."), code="password_changed"
+            )
+
+        return user
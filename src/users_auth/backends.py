@@ -0,0 +1,44 @@
+import logging
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+from .hashing import HashingBusy, make_password, verify_password
+
+logger = logging.getLogger(__name__)
+
+
+class PooledModelBackend(ModelBackend):
+    """ModelBackend, который проверяет пароль в пуле хэширования
+    (src.users_auth.hashing). Если пул занят, выбрасывает HashingBusy."""
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        user_model = get_user_model()
+        if username is None:
+            username = kwargs.get(user_model.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = user_model._default_manager.get_by_natural_key(username)
+        except user_model.DoesNotExist:
+            # Как и ModelBackend, хэшируем пароль впустую, чтобы по времени
+            # ответа нельзя было понять, существует ли пользователь
+            make_password(password)
+            return None
+
+        is_correct, must_update = verify_password(password, user.password)
+        if not is_correct or not self.user_can_authenticate(user):
+            return None
+        if must_update:
+            self._rehash(user, password)
+        return user
+
+    def _rehash(self, user, password):
+        """Сменился алгоритм или параметры хэшера - перехэшируем пароль.
+        Не обязательно: если пул занят, сделаем это при следующем входе."""
+        try:
+            user.password = make_password(password)
+        except HashingBusy:
+            logger.info("Пул хэширования занят, пароль %s не перехэширован", user.pk)
+            return
+        user.save(update_fields=["password"])
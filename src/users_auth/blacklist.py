@@ -0,0 +1,87 @@
+import threading
+import time
+
+from django.conf import settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+
+class BlacklistCache:
+    """Кэш JTI токенов из черного списка в памяти процесса.
+
+    Вместо запроса к БД на каждую проверку токена держим множество JTI
+    и раз в refresh_interval секунд догружаем только новые записи
+    (id больше последнего прочитанного). Раз в full_reload_interval
+    множество перечитывается целиком, чтобы выбросить удаленные записи.
+
+    Транзакции коммитятся не в порядке id: строка с меньшим id может
+    появиться после строки с большим. Поэтому последние overlap id
+    перечитываются при каждой догрузке.
+    """
+
+    def __init__(self, refresh_interval=5, full_reload_interval=3600, overlap=100):
+        self.refresh_interval = refresh_interval
+        self.full_reload_interval = full_reload_interval
+        self.overlap = overlap
+        self._lock = threading.Lock()
+        self._jtis = set()
+        self._last_id = 0
+        self._refreshed_at = None
+        self._loaded_at = None
+
+    def _load(self, full):
+        if full:
+            jtis = set()
+            last_id = 0
+        else:
+            jtis = self._jtis
+            last_id = self._last_id
+
+        rows = (
+            BlacklistedToken.objects.filter(id__gt=max(last_id - self.overlap, 0))
+            .order_by("id")
+            .values_list("id", "token__jti")
+        )
+        for row_id, jti in rows.iterator(chunk_size=2000):
+            jtis.add(jti)
+            last_id = max(last_id, row_id)
+
+        self._jtis = jtis
+        self._last_id = last_id
+
+    def refresh(self, force=False):
+        """Догружает новые записи, если кэш устарел."""
+        now = time.monotonic()
+        with self._lock:
+            if self._loaded_at is None or (
+                now - self._loaded_at >= self.full_reload_interval
+            ):
+                self._load(full=True)
+                self._loaded_at = now
+            elif force or now - self._refreshed_at >= self.refresh_interval:
+                self._load(full=False)
+            else:
+                return
+            self._refreshed_at = now
+
+    def add(self, jti):
+        """Добавляет JTI сразу, не дожидаясь следующего обновления."""
+        with self._lock:
+            self._jtis.add(jti)
+
+    def clear(self):
+        with self._lock:
+            self._jtis = set()
+            self._last_id = 0
+            self._refreshed_at = None
+            self._loaded_at = None
+
+    def __contains__(self, jti):
+        self.refresh()
+        return jti in self._jtis
+
+
+blacklist_cache = BlacklistCache(
+    refresh_interval=getattr(settings, "TOKEN_BLACKLIST_CACHE_REFRESH", 5),
+    full_reload_interval=getattr(settings, "TOKEN_BLACKLIST_CACHE_FULL_RELOAD", 3600),
+    overlap=getattr(settings, "TOKEN_BLACKLIST_CACHE_OVERLAP", 100),
+)
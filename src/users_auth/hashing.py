@@ -0,0 +1,81 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class HashingBusy(Exception):
+    """Все слоты пула хэширования заняты, запрос нужно отклонить (429)."""
+
+
+def _init_worker(settings_module):
+    """Настраивает Django в дочернем процессе пула."""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+
+    import django
+
+    django.setup()
+
+
+class HashingExecutor:
+    """Ограниченный пул процессов для хэширования паролей.
+
+    PBKDF2/scrypt/argon2 загружают CPU и держат GIL, поэтому считаем их
+    в отдельных процессах. Одновременно в работе и в очереди может быть
+    не больше max_pending задач, остальные запросы сразу получают
+    HashingBusy. При workers=0 хэширование выполняется в текущем потоке.
+    """
+
+    def __init__(self, workers, max_pending):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        initializer=_init_worker,
+                        initargs=(os.environ["DJANGO_SETTINGS_MODULE"],),
+                    )
+        return self._pool
+
+    def run(self, func, *args):
+        if not self._slots.acquire(blocking=False):
+            raise HashingBusy()
+        try:
+            if self.workers == 0:
+                return func(*args)
+            return self._get_pool().submit(func, *args).result()
+        finally:
+            self._slots.release()
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+
+executor = HashingExecutor(
+    workers=settings.PASSWORD_HASHING_WORKERS,
+    max_pending=settings.PASSWORD_HASHING_MAX_PENDING,
+)
+
+
+def make_password(password):
+    """Хэширует пароль в пуле."""
+    return executor.run(hashers.make_password, password)
+
+
+def verify_password(password, encoded):
+    """Проверяет пароль в пуле. Возвращает (совпал, нужно_перехэшировать)."""
+    return executor.run(hashers.verify_password, password, encoded)
@@ -0,0 +1,21 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("token_blacklist", "0013_alter_blacklistedtoken_options_and_more"),
+    ]
+
+    # Индекс для удаления просроченных токенов (prune_tokens).
+    # Таблица принадлежит simplejwt, поэтому индекс создаем через SQL.
+    operations = [
+        migrations.RunSQL(
+            sql=(
+                "CREATE INDEX IF NOT EXISTS token_blacklist_outstanding_expires_idx "
+                "ON token_blacklist_outstandingtoken (expires_at);"
+            ),
+            reverse_sql=(
+                "DROP INDEX IF EXISTS token_blacklist_outstanding_expires_idx;"
+            ),
+        ),
+    ]
@@ -0,0 +1,12 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import invalidate_user
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def reset_user_cache(sender, instance, **kwargs):
+    """Сбрасываем кэш пользователя при любом изменении."""
+    invalidate_user(instance.pk)
@@ -0,0 +1,25 @@
+from src.core.throttling import IPThrottle, TokenBucketThrottle
+
+
+class LoginIPThrottle(IPThrottle):
+    scope = "login_ip"
+
+
+class LoginUsernameThrottle(TokenBucketThrottle):
+    """Лимит попыток входа на одно имя пользователя (перебор паролей)."""
+
+    scope = "login_username"
+
+    def get_key(self, request, view):
+        username = request.data.get("username")
+        if not isinstance(username, str) or not username:
+            return None
+        return username.lower()
+
+
+class RegisterIPThrottle(IPThrottle):
+    scope = "register_ip"
+
+
+class TokenRefreshIPThrottle(IPThrottle):
+    scope = "token_refresh_ip"
@@ -5,14 +5,35 @@ from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.exceptions import TokenError
-from rest_framework_simplejwt.tokens import RefreshToken
 
+from src.core.throttling import EarlyThrottleMixin
 
-class RegisterView(APIView):
+from .hashing import HashingBusy, make_password
+from .throttling import (
+    LoginIPThrottle,
+    LoginUsernameThrottle,
+    RegisterIPThrottle,
+    TokenRefreshIPThrottle,
+)
+from .tokens import CachedRefreshToken
+
+
+def busy_response():
+    """Ответ, когда пул хэширования паролей переполнен."""
+    response = Response(
+        {"error": "Сервер перегружен, повторите попытку позже"},
+        status=status.HTTP_429_TOO_MANY_REQUESTS,
+    )
+    response["Retry-After"] = "1"
+    return response
+
+
+class RegisterView(EarlyThrottleMixin, APIView):
     """Регистрация пользователя
     POST /api/auth/register."""
 
     permission_classes = (AllowAny,)
+    throttle_classes = (RegisterIPThrottle,)
 
     def post(self, request):
         username = request.data.get("username")
@@ -31,11 +52,17 @@ class RegisterView(APIView):
                 {"error": "Username already exists"}, status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Создаем пользователя
-        user = User.objects.create_user(username=username, password=password)
+        # Хэшируем пароль в пуле процессов и создаем пользователя
+        try:
+            password_hash = make_password(password)
+        except HashingBusy:
+            return busy_response()
+        user = User.objects.create(
+            username=User.normalize_username(username), password=password_hash
+        )
 
         # Создаем токены
-        refresh = RefreshToken.for_user(user)
+        refresh = CachedRefreshToken.for_user(user)
 
         response = Response(
             {
@@ -55,11 +82,12 @@ class RegisterView(APIView):
         return response
 
 
-class LoginView(APIView):
+class LoginView(EarlyThrottleMixin, APIView):
     """Вход пользователя
     POST /api/auth/login."""
 
     permission_classes = (AllowAny,)
+    throttle_classes = (LoginIPThrottle, LoginUsernameThrottle)
 
     def post(self, request):
         username = request.data.get("username")
@@ -71,12 +99,17 @@ class LoginView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Проверяем логин/пароль
-        user = authenticate(username=username, password=password)
+        # Проверяем логин/пароль через AUTHENTICATION_BACKENDS
+        # (PooledModelBackend хэширует в пуле процессов). При неудаче
+        # Django отправляет сигнал user_login_failed.
+        try:
+            user = authenticate(request, username=username, password=password)
+        except HashingBusy:
+            return busy_response()
 
         if user is not None:
             # Создаем токены
-            refresh = RefreshToken.for_user(user)
+            refresh = CachedRefreshToken.for_user(user)
 
             response = Response(
                 {
@@ -99,11 +132,12 @@ class LoginView(APIView):
         )
 
 
-class TokenRefreshView(APIView):
+class TokenRefreshView(EarlyThrottleMixin, APIView):
     """Механизм обновления токенов с помощью Refresh Token
     POST /api/auth/token/refresh."""
 
     permission_classes = (AllowAny,)
+    throttle_classes = (TokenRefreshIPThrottle,)
 
     def post(self, request):
         if request.data.get("refresh"):
@@ -119,7 +153,7 @@ class TokenRefreshView(APIView):
             )
 
         try:
-            refresh = RefreshToken(refresh_token)
+            refresh = CachedRefreshToken(refresh_token)
 
             # Если ROTATE_REFRESH_TOKENS = True, создается новый refresh
             # Создаем response с новым access_token
@@ -158,7 +192,7 @@ class LogoutView(APIView):
 
         try:
             # Добавляем в черный список
-            token = RefreshToken(refresh_token)
+            token = CachedRefreshToken(refresh_token)
             token.blacklist()
 
             return Response({"message": "Вы успешно вышли"})